@@ -7,15 +7,16 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
 from supabase import create_client, Client
-from openai import OpenAI
 from .utils import (
-    LOCAL_API_BASE,
     LOCAL_CHAT_MODEL,
     LOCAL_EMBEDDING_MODEL,
+    get_local_llm_client,
     get_top_producing_countries,
     search_suppliers,
     search_suppliers_v2,
     mail,
+    orjson,
+    OrjsonJSONProvider,
 )
 from .erp_api import erp_bp
 from .socketio_instance import socketio
@@ -155,6 +156,8 @@ model_to_use = LOCAL_CHAT_MODEL
 # === Flask & CORS      ===
 # =========================
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonJSONProvider(app)
 # Allow credentials so cookies/headers (if any) are sent by the browser
 CORS(app, supports_credentials=True)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'aslkdjfhg')
@@ -196,7 +199,9 @@ if not app.config['TAVILY_API_KEY']:
 # =========================
 # === Socket.IO Init    ===
 # =========================
-socketio.init_app(app, cors_allowed_origins="*")
+# Pinned to eventlet, which production runs under (gunicorn --worker-class eventlet)
+# and Flask-SocketIO would auto-select anyway since it is in requirements.txt.
+socketio.init_app(app, cors_allowed_origins="*", async_mode="eventlet")
 
 # =========================
 # === Supabase / Auth   ===
@@ -322,7 +327,7 @@ def login():
 def get_ai_completion(prompt_text, model="LOCAL_CHAT_MODEL"):
     """Generic function to get a completion from OpenAI (kept on gpt-4o-mini)."""
     try:
-        client= OpenAI(api_key="ollama",base_url=LOCAL_API_BASE)
+        client = get_local_llm_client()
         completion = client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt_text}]
@@ -460,7 +465,7 @@ def generate_and_save_project_embedding():
         content_to_embed = f"Title: {project.get('title', '')}\nDescription: {project.get('description', '')}\nRequirements: {json.dumps(project.get('requirements', {}))}"
 
         # 3. Generate the embedding with OpenAI
-        client= OpenAI(api_key="ollama",base_url=LOCAL_API_BASE)
+        client = get_local_llm_client()
         embedding_model_to_use = LOCAL_EMBEDDING_MODEL
         
         embedding_response = client.embeddings.create(
@@ -513,7 +518,7 @@ def generate_supplier_embedding():
         )
 
         # 3. Generate the embedding
-        client= OpenAI(api_key="ollama",base_url=LOCAL_API_BASE)
+        client = get_local_llm_client()
         embedding_model_to_use = LOCAL_EMBEDDING_MODEL
         
         embedding_response = client.embeddings.create(
@@ -581,7 +586,7 @@ def unified_search():
         return jsonify({"error": "Missing product or country"}), 400
 
     if mode == 'quick':
-        # Legacy Serper-based search (unchanged; validate_link now uses sync fetch underneath)
+        # Legacy Serper-based search
         suppliers = search_suppliers(
             product,
             country,
@@ -649,7 +654,7 @@ Rules:
 - Keep answers crisp; practical takeaways for buyers.
         """.strip()
 
-        client= OpenAI(api_key="ollama",base_url=LOCAL_API_BASE)
+        client = get_local_llm_client()
         model_to_use = LOCAL_CHAT_MODEL
         
         completion = client.chat.completions.create(
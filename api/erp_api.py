@@ -1,22 +1,48 @@
+import hashlib
+import heapq
 import json
+import logging
 import os
+import re
+import threading
 import time
 import psycopg2
-from flask import request, jsonify, Blueprint
+from psycopg2 import sql
+from flask import (
+    Blueprint,
+    Response,
+    g,
+    has_app_context,
+    has_request_context,
+    jsonify,
+    make_response,
+    request,
+    stream_with_context,
+)
+from flask_socketio import join_room
 from .socketio_instance import socketio
 from supabase import create_client, Client
 from dotenv import load_dotenv
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 from pathlib import Path
 import uuid
 import requests
-from openai import OpenAI
 from urllib.parse import parse_qsl, quote, unquote, urlsplit, urlunsplit, urlencode
 
 # --- Local Imports ---
 from . import database_manager
-from .utils import LOCAL_API_BASE, resolve_chat_model, resolve_embedding_model
-from collections import defaultdict
+from .utils import (
+    erp_data_to_toon,
+    fast_json_dumps,
+    fast_json_loads,
+    get_local_llm_client,
+    json_default,
+    resolve_chat_model,
+    resolve_embedding_model,
+)
+from collections import Counter, OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from decimal import Decimal
 from typing import Any, Dict, Iterable, List, Tuple, Optional
 
@@ -50,6 +76,91 @@ INDUSTRY_CONFIGS = {
     'custom': 'erp_configs/default_erp_config.json'
 }
 
+# Supplier identity columns on order rows, in priority order.
+SUPPLIER_KEYS = ("supplier_name", "supplier", "vendor_name", "vendor", "supplier_id")
+IGNORED_SUPPLIER_LABELS = frozenset({"None", "null", "0"})
+
+OPEN_STATUSES = frozenset({"open", "pending", "sourcing", "requested", "draft"})
+COMPLETED_STATUSES = frozenset({"completed", "complete", "fulfilled", "delivered", "closed"})
+
+# business_metrics column aliases for each headline metric, in priority order.
+TOP_METRIC_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "revenue": ("revenue", "net_revenue", "purchase_total", "sales"),
+    "orders": ("orders", "orders_count", "order_volume"),
+    "activeSuppliers": ("active_suppliers", "supplier_count", "engaged_suppliers"),
+    "pendingTasks": ("pending_tasks", "open_tasks", "pending_actions"),
+    "performanceIndex": ("performance_index", "performance_score", "efficiency_score", "project_health"),
+}
+
+# --- Overview Response Cache ---
+# Per-user snapshot of the /overview payload. Entries expire after a short TTL
+# and are dropped as soon as the user writes through the ERP API.
+OVERVIEW_CACHE_TTL_SECONDS = 30
+_overview_cache: Dict[Tuple[str, bool], Dict[str, Any]] = {}
+_overview_cache_versions: Dict[str, int] = defaultdict(int)
+_overview_cache_lock = threading.Lock()
+
+
+def _overview_etag(user_id: str, entry: Dict[str, Any], include_summary: bool) -> str:
+    has_summary = entry["payload"].get("aiSummary") is not None
+    raw = f"{user_id}:{entry['version']}:{entry['created_at']}:{include_summary}:{has_summary}"
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def _get_cached_overview(user_id: str, include_summary: bool) -> Optional[Dict[str, Any]]:
+    with _overview_cache_lock:
+        entry = _overview_cache.get((user_id, include_summary))
+        if not entry:
+            return None
+        if (
+            entry["version"] != _overview_cache_versions[user_id]
+            or time.monotonic() - entry["created_at"] > OVERVIEW_CACHE_TTL_SECONDS
+        ):
+            _overview_cache.pop((user_id, include_summary), None)
+            return None
+        return entry
+
+
+def _store_cached_overview(user_id: str, include_summary: bool, payload: Dict[str, Any]) -> Dict[str, Any]:
+    with _overview_cache_lock:
+        entry = {
+            "payload": payload,
+            "version": _overview_cache_versions[user_id],
+            "created_at": time.monotonic(),
+        }
+        _overview_cache[(user_id, include_summary)] = entry
+        return entry
+
+
+def _store_cached_overview_summary(user_id: str | None, cache_version: int, summary_text: str) -> None:
+    if not user_id:
+        return
+    with _overview_cache_lock:
+        entry = _overview_cache.get((user_id, True))
+        if entry and entry["version"] == cache_version:
+            entry["payload"] = {**entry["payload"], "aiSummary": summary_text, "aiSummaryPending": False}
+
+
+def _invalidate_overview_cache(user_id: str | None) -> None:
+    if not user_id:
+        return
+    with _overview_cache_lock:
+        _overview_cache_versions[user_id] += 1
+        _overview_cache.pop((user_id, True), None)
+        _overview_cache.pop((user_id, False), None)
+
+
+def _overview_response(user_id: str, include_summary: bool, entry: Dict[str, Any]):
+    etag = _overview_etag(user_id, entry, include_summary)
+    if request.if_none_match.contains(etag):
+        response = make_response("", 304)
+    else:
+        response = jsonify(entry["payload"])
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
 # --- Overview Analytics Helpers ---
 
 def _safe_number(value: Any, default: float = 0.0) -> float:
@@ -66,22 +177,22 @@ def _safe_number(value: Any, default: float = 0.0) -> float:
 
 
 def _safe_int(value: Any, default: int = 0) -> int:
+    if type(value) is int:
+        return value
     try:
         return int(round(_safe_number(value, float(default))))
     except (TypeError, ValueError):
         return default
 
 
-def _parse_period(raw_value: Any) -> datetime | None:
-    if not raw_value:
-        return None
-    if isinstance(raw_value, datetime):
-        return raw_value
-    if isinstance(raw_value, date):
-        return datetime.combine(raw_value, datetime.min.time())
+PERIOD_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%Y-%m", "%Y%m%d", "%d-%m-%Y", "%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S")
 
-    value = str(raw_value)
-    for fmt in ("%Y-%m-%d", "%Y/%m/%d", "%Y-%m", "%Y%m%d", "%d-%m-%Y", "%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"):
+
+@lru_cache(maxsize=4096)
+def _parse_period_text(value: str) -> datetime | None:
+    # Rows repeat the same date strings (month starts, period ends), so the
+    # strptime fallthrough is memoised per distinct string.
+    for fmt in PERIOD_FORMATS:
         try:
             parsed = datetime.strptime(value, fmt)
             return parsed
@@ -95,6 +206,34 @@ def _parse_period(raw_value: Any) -> datetime | None:
         return None
 
 
+def _parse_period(raw_value: Any) -> datetime | None:
+    if not raw_value:
+        return None
+    if isinstance(raw_value, datetime):
+        return raw_value
+    if isinstance(raw_value, date):
+        return datetime.combine(raw_value, datetime.min.time())
+    return _parse_period_text(str(raw_value))
+
+
+def _pick(row: Dict[str, Any], keys: Iterable[str], default: Any = None) -> Any:
+    """Return the first present value among keys; unlike an `or` chain, 0 counts as present."""
+    for key in keys:
+        value = row.get(key)
+        if value is not None and value != "":
+            return value
+    return default
+
+
+def _row_status(row: Dict[str, Any]) -> str:
+    status = row.get("status")
+    if not status:
+        return ""
+    if isinstance(status, str):
+        return status.lower()
+    return str(status).lower()
+
+
 def _filter_rows_for_user(rows: Iterable[Dict[str, Any]], user_id: str | None) -> List[Dict[str, Any]]:
     if not rows:
         return []
@@ -106,10 +245,44 @@ def _filter_rows_for_user(rows: Iterable[Dict[str, Any]], user_id: str | None) -
     return rows_list
 
 
-def _latest_row_by_period(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
-    if not rows:
-        return {}
+def _select_rows(
+    user_supabase: Client,
+    table_name: str,
+    order_column: Optional[str] = None,
+    user_id: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch all rows of table_name, newest first when order_column is set, filtered
+    to user_id in the query itself. When the table has no user_id column, retry
+    without the filter (applied by _filter_rows_for_user instead), keeping the
+    ORDER BY; only a missing order column falls back to an unordered select.
+    """
+    attempts = [user_id]
+    if user_id:
+        attempts.append(None)
 
+    for attempt_user_id in attempts:
+        try:
+            query = user_supabase.table(table_name).select("*")
+            if attempt_user_id:
+                query = query.eq("user_id", attempt_user_id)
+            if order_column:
+                query = query.order(order_column, desc=True, nullsfirst=False)
+            rows = list(query.execute().data or [])
+        except Exception:
+            continue
+        if user_id and not attempt_user_id:
+            return _filter_rows_for_user(rows, user_id)
+        return rows
+
+    # The order column itself is missing: unordered, callers must not rely on row order.
+    response = user_supabase.table(table_name).select("*").execute()
+    return _filter_rows_for_user(response.data or [], user_id)
+
+
+def _latest_row_by_period(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Always compare parsed dates: the rows may come from the unordered fallback
+    # in _select_rows, and a text period_end column sorts lexically in the database.
     def row_key(row: Dict[str, Any]):
         for key in ("period_end", "period", "period_start", "month", "captured_at", "created_at", "updated_at", "date"):
             candidate = row.get(key)
@@ -121,16 +294,34 @@ def _latest_row_by_period(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
     return max(rows, key=row_key, default={})
 
 
-def _compute_month_groups(rows: List[Dict[str, Any]], value_key: str) -> List[Dict[str, Any]]:
-    month_totals = defaultdict(float)
+MONTH_GROUP_DATE_KEYS = ("period", "month", "period_start", "date", "captured_at", "created_at")
+
+
+def _month_labels(rows: List[Dict[str, Any]], date_keys: Tuple[str, ...] = MONTH_GROUP_DATE_KEYS) -> List[Optional[str]]:
+    """Resolve each row's YYYY-MM label once so several value columns can be grouped without re-parsing dates."""
+    labels: List[Optional[str]] = []
     for row in rows:
-        for key in ("period", "month", "period_start", "date", "captured_at", "created_at"):
-            date_val = row.get(key)
-            parsed = _parse_period(date_val)
+        label = None
+        for key in date_keys:
+            parsed = _parse_period(row.get(key))
             if parsed:
-                month_label = parsed.strftime("%Y-%m")
-                month_totals[month_label] += _safe_number(row.get(value_key))
+                label = parsed.strftime("%Y-%m")
                 break
+        labels.append(label)
+    return labels
+
+
+def _compute_month_groups(
+    rows: List[Dict[str, Any]],
+    value_key: str,
+    month_labels: Optional[List[Optional[str]]] = None,
+) -> List[Dict[str, Any]]:
+    if month_labels is None:
+        month_labels = _month_labels(rows)
+    month_totals = defaultdict(float)
+    for month_label, row in zip(month_labels, rows):
+        if month_label:
+            month_totals[month_label] += _safe_number(row.get(value_key))
     return [
         {"month": month, "value": round(amount, 2)}
         for month, amount in sorted(month_totals.items())
@@ -151,20 +342,17 @@ def _compute_orders_month_groups(orders: List[Dict[str, Any]]) -> List[Dict[str,
     ]
 
 
+def _order_supplier(order: Dict[str, Any]) -> Any:
+    for key in SUPPLIER_KEYS:
+        value = order.get(key)
+        if value:
+            return value
+    return None
+
+
 def _supplier_counts(orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    counts = defaultdict(int)
-    for order in orders:
-        supplier = (
-            order.get("supplier_name")
-            or order.get("supplier")
-            or order.get("vendor_name")
-            or order.get("vendor")
-            or order.get("supplier_id")
-            or "Unknown"
-        )
-        counts[str(supplier)] += 1
-    sorted_counts = sorted(counts.items(), key=lambda item: item[1], reverse=True)
-    return [{"supplier": supplier, "orders": count} for supplier, count in sorted_counts[:8]]
+    counts = Counter(str(_order_supplier(order) or "Unknown") for order in orders)
+    return [{"supplier": supplier, "orders": count} for supplier, count in counts.most_common(8)]
 
 
 def _purchase_expense_totals(metrics_rows: List[Dict[str, Any]], orders: List[Dict[str, Any]]) -> Dict[str, float]:
@@ -515,6 +703,7 @@ def _ensure_sync_table(user_supabase: Client, table_name: str):
         updated_at timestamp with time zone DEFAULT now(),
         metadata jsonb
     );
+    CREATE INDEX IF NOT EXISTS "{table_name}_user_id_idx" ON public."{table_name}" (user_id, created_at DESC);
     """
     trigger_sql = f"""
     CREATE OR REPLACE FUNCTION public.{table_name}_set_timestamp()
@@ -572,7 +761,7 @@ def _extract_user_id_from_request() -> str | None:
     if not user_id:
         sid = getattr(request, "sid", None)
         if sid:
-            user_id = socketio.server.environ.get(sid, {}).get("userId")
+            user_id = _SOCKET_SESSIONS.get(sid, {}).get("userId")
     return user_id
 
 def get_client_for_request() -> Client:
@@ -741,6 +930,37 @@ def ensure_user_configuration_table(user_supabase: Client, user_id: str, retries
 # --- Blueprint Definition ---
 erp_bp = Blueprint('erp_bp', __name__)
 
+@erp_bp.after_request
+def _invalidate_overview_after_write(response):
+    if request.method in ("POST", "PUT", "DELETE") and response.status_code < 400:
+        _invalidate_overview_cache(_extract_user_id_from_request())
+    return response
+
+
+def _emit_data_changed(entity_ids: List[str]) -> None:
+    for entity_id in entity_ids:
+        socketio.emit('data_changed', {'entity_id': entity_id})
+
+
+def _mark_entity_changed(entity_id: str) -> None:
+    """
+    Queue a 'data_changed' event for the entity. Inside an ERP HTTP request the
+    ids are coalesced and emitted once each when the request tears down;
+    elsewhere (Socket.IO handlers) the event is emitted immediately.
+    """
+    if has_request_context() and request.blueprint == erp_bp.name:
+        g.setdefault("_pending_data_changed", set()).add(entity_id)
+        return
+    socketio.emit('data_changed', {'entity_id': entity_id})
+
+
+@erp_bp.teardown_request
+def _flush_data_changed(exc):
+    pending = g.pop("_pending_data_changed", None)
+    if pending:
+        socketio.start_background_task(_emit_data_changed, sorted(pending))
+
+
 @erp_bp.route("/configure", methods=["POST"])
 def configure_workspace():
     # Simplified configuration for ERP-only mode - no auth required
@@ -811,7 +1031,7 @@ def workspace():
 
         user_supabase.table('user_configurations').upsert({
             "user_id": user_id,
-            "config_json": json.dumps(config_data),
+            "config_json": fast_json_dumps(config_data),
             "industry_id": industry
         }).execute()
 
@@ -853,8 +1073,8 @@ def get_config():
         config_data = {"domains": []}
         if response.data and response.data.get('config_json'):
             config_data = response.data['config_json']
-            if isinstance(config_data, str):
-                config_data = json.loads(config_data)
+            if isinstance(config_data, (str, bytes)):
+                config_data = fast_json_loads(config_data)
 
         return jsonify({"erp_config": config_data})
     except ValueError as exc:
@@ -880,7 +1100,7 @@ def delete_erp_instance():
         tables_to_drop = set()
         try:
             user_supabase = get_client_for_request()
-            erp_config = get_config_from_db_secure(user_supabase, user_id)
+            erp_config = get_cached_config(user_supabase, user_id)
             for domain in erp_config.get("domains", []):
                 for entity_id in domain.get("entities", {}):
                     tables_to_drop.add(entity_id)
@@ -894,9 +1114,12 @@ def delete_erp_instance():
         with psycopg2.connect(user_db_url) as conn:
             conn.autocommit = True
             with conn.cursor() as cur:
-                for table_name in tables_to_drop:
-                    sql_statement = f'DROP TABLE IF EXISTS public."{table_name}" CASCADE;'
-                    cur.execute(sql_statement)
+                # One round-trip for every drop instead of one execute per table.
+                drop_statements = sql.SQL("; ").join(
+                    sql.SQL("DROP TABLE IF EXISTS public.{} CASCADE").format(sql.Identifier(table_name))
+                    for table_name in sorted(tables_to_drop)
+                )
+                cur.execute(drop_statements)
 
         database_manager.delete_user_credentials(user_id)
         return jsonify({"status": "ok", "message": "ERP instance deleted successfully."})
@@ -904,6 +1127,44 @@ def delete_erp_instance():
     except Exception as e:
         return jsonify({"error": f"An unexpected error occurred during deletion: {e}"}), 500
 
+
+def _generate_overview_summary(summary_context: str, user_id: str | None, cache_version: int) -> None:
+    """Background task: ask the model for the overview narrative and emit it as 'overview_summary_ready'."""
+    try:
+        messages = [
+            {
+                "role": "system",
+                "content": "You are an ERP business analyst who writes concise executive summaries about operational health.",
+            },
+            {
+                "role": "user",
+                "content": (
+                    "Analyse the following JSON payload of ERP dashboard metrics and craft a short narrative (2-3 paragraphs) "
+                    "highlighting financial performance, supplier engagement, operational efficiency, and any risks. "
+                    "Keep it under 160 words and use plain language. JSON:\n"
+                    f"{summary_context}"
+                ),
+            },
+        ]
+
+        client = get_local_llm_client()
+        model_to_use = LOCAL_CHAT_MODEL
+        summary_response = client.chat.completions.create(
+            model=model_to_use,
+            messages=messages,
+            temperature=0.4,
+            max_tokens=220,
+        )
+        summary_text = summary_response.choices[0].message.content.strip()
+    except Exception as exc:
+        summary_text = f"Could not generate AI summary: {exc}"
+
+    _store_cached_overview_summary(user_id, cache_version, summary_text)
+    if user_id:
+        # Only this user's sockets: the summary describes their ERP data.
+        socketio.emit('overview_summary_ready', {'user_id': user_id, 'aiSummary': summary_text}, to=user_id)
+
+
 @erp_bp.route("/overview", methods=["GET"])
 def get_overview_snapshot():
     include_summary = request.args.get("includeSummary", "true").lower() != "false"
@@ -916,41 +1177,34 @@ def get_overview_snapshot():
     except Exception as exc:
         return jsonify({"error": f"Authentication failed: {exc}"}), 401
 
+    cached_entry = _get_cached_overview(user_id, include_summary)
+    if cached_entry:
+        return _overview_response(user_id, include_summary, cached_entry)
+
     metrics_rows: List[Dict[str, Any]] = []
     orders_rows: List[Dict[str, Any]] = []
     rfq_rows: List[Dict[str, Any]] = []
     rfp_rows: List[Dict[str, Any]] = []
 
-    erp_config = get_config_from_db_secure(user_supabase, user_id)
+    erp_config = get_cached_config(user_supabase, user_id)
 
     try:
-        metrics_resp = user_supabase.table("business_metrics").select("*").execute()
-        if metrics_resp.data:
-            metrics_rows = list(metrics_resp.data)
+        metrics_rows = _select_rows(user_supabase, "business_metrics", order_column="period_end", user_id=user_id)
     except Exception:
         metrics_rows = []
 
     try:
-        orders_resp = user_supabase.table("orders").select("*").execute()
-        if orders_resp.data:
-            orders_rows = list(orders_resp.data)
+        orders_rows = _select_rows(user_supabase, "orders", order_column="created_at", user_id=user_id)
     except Exception:
         orders_rows = []
 
-    metrics_rows = _filter_rows_for_user(metrics_rows, user_id)
-    orders_rows = _filter_rows_for_user(orders_rows, user_id)
-
     try:
-        rfq_resp = user_supabase.table("rfq_requests").select("*").execute()
-        if rfq_resp.data:
-            rfq_rows = _filter_rows_for_user(list(rfq_resp.data), user_id)
+        rfq_rows = _select_rows(user_supabase, "rfq_requests", order_column="created_at", user_id=user_id)
     except Exception:
         rfq_rows = []
 
     try:
-        rfp_resp = user_supabase.table("rfp_requests").select("*").execute()
-        if rfp_resp.data:
-            rfp_rows = _filter_rows_for_user(list(rfp_resp.data), user_id)
+        rfp_rows = _select_rows(user_supabase, "rfp_requests", order_column="created_at", user_id=user_id)
     except Exception:
         rfp_rows = []
 
@@ -962,77 +1216,40 @@ def get_overview_snapshot():
         entity_lookup, erp_config, metrics_rows, orders_rows, rfq_rows, rfp_rows
     )
 
-    unique_suppliers = {
-        str(
-            order.get("supplier_name")
-            or order.get("supplier")
-            or order.get("vendor_name")
-            or order.get("vendor")
-            or order.get("supplier_id")
-        )
-        for order in orders_rows
-        if (
-            order.get("supplier_name")
-            or order.get("supplier")
-            or order.get("vendor_name")
-            or order.get("vendor")
-            or order.get("supplier_id")
-        )
-    }
-    unique_suppliers.discard("None")
-    unique_suppliers.discard("null")
-    unique_suppliers.discard("0")
+    unique_suppliers: set[str] = set()
+    add_supplier = unique_suppliers.add
+    for order in orders_rows:
+        for key in SUPPLIER_KEYS:
+            supplier = order.get(key)
+            if supplier:
+                supplier_label = str(supplier)
+                if supplier_label not in IGNORED_SUPPLIER_LABELS:
+                    add_supplier(supplier_label)
+                break
 
     purchase_expense_totals = _purchase_expense_totals(metrics_rows, orders_rows)
 
-    open_statuses = {"open", "pending", "sourcing", "requested", "draft"}
-    pending_rfq = sum(1 for row in rfq_rows if str(row.get("status") or "").lower() in open_statuses)
-    pending_rfp = sum(1 for row in rfp_rows if str(row.get("status") or "").lower() in open_statuses)
+    pending_rfq = sum(1 for row in rfq_rows if _row_status(row) in OPEN_STATUSES)
+    pending_rfp = sum(1 for row in rfp_rows if _row_status(row) in OPEN_STATUSES)
     total_pending_requests = pending_rfq + pending_rfp
 
     top_metrics = {
         "revenue": round(
-            _safe_number(
-                latest_metrics.get("revenue")
-                or latest_metrics.get("net_revenue")
-                or latest_metrics.get("purchase_total")
-                or latest_metrics.get("sales")
-                or purchase_expense_totals["purchases"]
-            ),
+            _safe_number(_pick(latest_metrics, TOP_METRIC_ALIASES["revenue"], purchase_expense_totals["purchases"])),
             2,
         ),
-        "orders": _safe_int(
-            latest_metrics.get("orders")
-            or latest_metrics.get("orders_count")
-            or latest_metrics.get("order_volume")
-            or len(orders_rows)
-        ),
+        "orders": _safe_int(_pick(latest_metrics, TOP_METRIC_ALIASES["orders"], len(orders_rows))),
         "activeSuppliers": _safe_int(
-            latest_metrics.get("active_suppliers")
-            or latest_metrics.get("supplier_count")
-            or latest_metrics.get("engaged_suppliers")
-            or len(unique_suppliers)
-        ),
-        "pendingTasks": _safe_int(
-            latest_metrics.get("pending_tasks")
-            or latest_metrics.get("open_tasks")
-            or latest_metrics.get("pending_actions")
-            or total_pending_requests
-        ),
-        "performanceIndex": round(
-            _safe_number(
-                latest_metrics.get("performance_index")
-                or latest_metrics.get("performance_score")
-                or latest_metrics.get("efficiency_score")
-                or latest_metrics.get("project_health")
-            ),
-            2,
+            _pick(latest_metrics, TOP_METRIC_ALIASES["activeSuppliers"], len(unique_suppliers))
         ),
+        "pendingTasks": _safe_int(_pick(latest_metrics, TOP_METRIC_ALIASES["pendingTasks"], total_pending_requests)),
+        "performanceIndex": round(_safe_number(_pick(latest_metrics, TOP_METRIC_ALIASES["performanceIndex"])), 2),
     }
 
-    monthly_revenue = _compute_month_groups(metrics_rows, "revenue")
+    metrics_month_labels = _month_labels(metrics_rows)
+    monthly_revenue = _compute_month_groups(metrics_rows, "revenue", metrics_month_labels)
     if not monthly_revenue:
-        monthly_revenue = _compute_month_groups(metrics_rows, "net_revenue")
+        monthly_revenue = _compute_month_groups(metrics_rows, "net_revenue", metrics_month_labels)
     if not monthly_revenue:
         monthly_revenue = _compute_orders_month_groups(orders_rows)
 
@@ -1076,9 +1293,8 @@ def get_overview_snapshot():
             if not parsed_date:
                 continue
             label = parsed_date.strftime("%Y-%m")
-            status = str(order.get("status") or "").lower()
             completion_buckets[label]["total"] += 1
-            if status in {"completed", "complete", "fulfilled", "delivered", "closed"}:
+            if _row_status(order) in COMPLETED_STATUSES:
                 completion_buckets[label]["completed"] += 1
 
         for label in sorted(completion_buckets.keys()):
@@ -1157,49 +1373,35 @@ def get_overview_snapshot():
             }
         )
 
-    response_payload["recentActivity"] = sorted(
-        [item for item in recent_activity if item.get("timestamp")],
+    response_payload["recentActivity"] = heapq.nlargest(
+        12,
+        (item for item in recent_activity if item.get("timestamp")),
         key=lambda item: item["timestamp"],
-        reverse=True,
-    )[:12]
+    )
 
     if include_summary:
-        try:
-            summary_context = json.dumps(response_payload, default=lambda o: o if isinstance(o, (int, float, str, list, dict)) else str(o))
-            messages = [
-                {
-                    "role": "system",
-                    "content": "You are an ERP business analyst who writes concise executive summaries about operational health.",
-                },
-                {
-                    "role": "user",
-                    "content": (
-                        "Analyse the following JSON payload of ERP dashboard metrics and craft a short narrative (2-3 paragraphs) "
-                        "highlighting financial performance, supplier engagement, operational efficiency, and any risks. "
-                        "Keep it under 160 words and use plain language. JSON:\n"
-                        f"{summary_context}"
-                    ),
-                },
-            ]
-
-            # openai.api_base = LOCAL_API_BASE
-            # openai.api_key = "ollama"
-
-
-            client = OpenAI(api_key="ollama",base_url=LOCAL_API_BASE)
-            model_to_use = LOCAL_CHAT_MODEL
-            summary_response = client.chat.completions.create(
-                model=model_to_use,
-                messages=messages,
-                temperature=0.4,
-                max_tokens=220,
-            )
-            summary_text = summary_response.choices[0].message.content.strip()
-            response_payload["aiSummary"] = summary_text
-        except Exception as exc:
-            response_payload["aiSummary"] = f"Could not generate AI summary: {exc}"
+        # Only the headline figures go to the model; entity stats and activity
+        # feeds grow with the workspace but add little to a 160-word summary.
+        summary_slim = {
+            "top": top_metrics,
+            "sourcing": response_payload["sourcingActivity"],
+            "dataHealth": response_payload["dataHealth"],
+            "purchaseExpense": purchase_expense_totals,
+            "monthlyRevenue": monthly_revenue[-6:],
+            "topSuppliers": supplier_engagement[:5],
+            "productivity": productivity_trend[-6:],
+        }
+        summary_context = fast_json_dumps(summary_slim, default=json_default)
+        # The completion takes seconds; return the dashboard now and push the
+        # summary over Socket.IO once it is ready.
+        response_payload["aiSummaryPending"] = True
 
-    return jsonify(response_payload)
+    cache_entry = _store_cached_overview(user_id, include_summary, response_payload)
+    if include_summary:
+        socketio.start_background_task(
+            _generate_overview_summary, summary_context, user_id, cache_entry["version"]
+        )
+    return _overview_response(user_id, include_summary, cache_entry)
 
 
 def _sync_sourcing_request(table_name: str, expected_type: str):
@@ -1221,13 +1423,15 @@ def _sync_sourcing_request(table_name: str, expected_type: str):
         record["total_items"] = _safe_int(record.get("total_items")) if record.get("total_items") is not None else None
         if not record.get("deadline"):
             record["deadline"] = None
-        record["created_at"] = record.get("created_at") or datetime.utcnow().isoformat()
-        record["updated_at"] = datetime.utcnow().isoformat()
+        # Naive UTC, same shape utcnow() produced, computed once for both stamps.
+        now_iso = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+        record["created_at"] = record.get("created_at") or now_iso
+        record["updated_at"] = now_iso
         record["metadata"] = metadata
 
         _ensure_sync_table(user_supabase, table_name)
         user_supabase.table(table_name).upsert(record).execute()
-        socketio.emit('data_changed', {'entity_id': table_name})
+        _mark_entity_changed(table_name)
         return jsonify({"status": "ok"})
     except Exception as exc:
         return jsonify({"error": str(exc)}), 500
@@ -1268,7 +1472,7 @@ def create_entity_record(entity_id):
                 response = user_supabase.table(entity_id).insert(payload).execute()
             else:
                 raise
-        socketio.emit('data_changed', {'entity_id': entity_id})
+        _mark_entity_changed(entity_id)
         return jsonify({"status": "ok", "data": response.data[0]})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -1288,7 +1492,7 @@ def update_entity_record(entity_id, record_id):
                 response = user_supabase.table(entity_id).update(payload).eq('id', record_id).execute()
             else:
                 raise
-        socketio.emit('data_changed', {'entity_id': entity_id})
+        _mark_entity_changed(entity_id)
         if response.data:
             return jsonify({"status": "ok", "data": response.data[0]})
         return jsonify({"error": "Record not found or no changes made"}), 404
@@ -1300,26 +1504,56 @@ def delete_entity_record(entity_id, record_id):
     try:
         user_supabase = get_client_for_request()
         user_supabase.table(entity_id).delete().eq('id', record_id).execute()
-        socketio.emit('data_changed', {'entity_id': entity_id})
+        _mark_entity_changed(entity_id)
         return jsonify({"status": "ok", "id": record_id})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 # --- Schema Customization ---
-def get_config_from_db_secure(user_supabase, user_id):
+def _fetch_config_row(user_supabase, user_id) -> Tuple[Dict[str, Any], Optional[str]]:
+    """The user's config and its updated_at; ({"domains": []}, None) when there is none."""
     try:
-        response = user_supabase.table('user_configurations').select('config_json').eq('user_id', user_id).single().execute()
+        response = user_supabase.table('user_configurations').select('config_json, updated_at').eq('user_id', user_id).single().execute()
         if not response.data or not response.data.get('config_json'):
-            return {"domains": []}
+            return {"domains": []}, None
         config_data = response.data['config_json']
-        return json.loads(config_data) if isinstance(config_data, str) else config_data
+        config = fast_json_loads(config_data) if isinstance(config_data, (str, bytes)) else config_data
+        return config, response.data.get('updated_at')
     except Exception as exc:
         message = str(exc)
         if "PGRST116" in message or "single row" in message.lower():
-            return {"domains": []}
+            return {"domains": []}, None
         raise
 
 
+def get_config_from_db_secure(user_supabase, user_id):
+    return _fetch_config_row(user_supabase, user_id)[0]
+
+
+def get_cached_config(user_supabase, user_id):
+    """
+    get_config_from_db_secure memoised on flask.g, so one HTTP request or
+    Socket.IO event (which gets its own app context) reads the config once.
+    """
+    if not has_app_context():
+        return get_config_from_db_secure(user_supabase, user_id)
+    cache = g.setdefault("_erp_config_cache", {})
+    if user_id not in cache:
+        versions = g.setdefault("_erp_config_versions", {})
+        cache[user_id], versions[user_id] = _fetch_config_row(user_supabase, user_id)
+    return cache[user_id]
+
+
+def _cached_config_version(user_id) -> Optional[str]:
+    """
+    updated_at of the config get_cached_config loaded for user_id, or None if
+    unknown (no app context, no row, or the config was saved in this request).
+    """
+    if not has_app_context():
+        return None
+    return g.get("_erp_config_versions", {}).get(user_id)
+
+
 def _find_entity_config(erp_config: Dict[str, Any], entity_id: str) -> Dict[str, Any] | None:
     for domain in erp_config.get("domains", []):
         entities = domain.get("entities", {})
@@ -1340,7 +1574,7 @@ def _normalize_record_payload(
     cleaned_payload: Dict[str, Any] = {}
 
     try:
-        erp_config = get_config_from_db_secure(user_supabase, user_id)
+        erp_config = get_cached_config(user_supabase, user_id)
     except Exception:
         erp_config = {"domains": []}
 
@@ -1394,15 +1628,19 @@ def _ensure_allow_all_policy(user_supabase: Client, table_name: str) -> None:
 def save_config_to_db_secure(user_supabase, user_id, config_data):
     user_supabase.table('user_configurations').upsert({
         "user_id": user_id,
-        "config_json": json.dumps(config_data)
+        "config_json": fast_json_dumps(config_data)
     }).execute()
+    if has_app_context():
+        g.setdefault("_erp_config_cache", {})[user_id] = config_data
+        g.get("_erp_config_versions", {}).pop(user_id, None)
+        g.pop("_date_fields_index", None)
 
 @erp_bp.route("/domains", methods=["POST"])
 def add_domain():
     try:
         user_supabase = get_client_for_request()
         user_id = _extract_user_id_from_request()
-        erp_config = get_config_from_db_secure(user_supabase, user_id)
+        erp_config = get_cached_config(user_supabase, user_id)
         data = request.json
         domain_name = data.get('name')
         if not domain_name:
@@ -1420,7 +1658,7 @@ def delete_domain(domain_id):
     try:
         user_supabase = get_client_for_request()
         user_id = _extract_user_id_from_request()
-        erp_config = get_config_from_db_secure(user_supabase, user_id)
+        erp_config = get_cached_config(user_supabase, user_id)
         domain_to_delete = next((d for d in erp_config['domains'] if d['id'] == domain_id), None)
         if not domain_to_delete:
             return jsonify({"error": "Domain not found"}), 404
@@ -1441,7 +1679,7 @@ def edit_domain(domain_id):
     try:
         user_supabase = get_client_for_request()
         user_id = _extract_user_id_from_request()
-        erp_config = get_config_from_db_secure(user_supabase, user_id)
+        erp_config = get_cached_config(user_supabase, user_id)
         new_name = request.json.get('name')
         domain_to_edit = next((d for d in erp_config['domains'] if d['id'] == domain_id), None)
         if not domain_to_edit:
@@ -1458,7 +1696,7 @@ def add_entity_to_domain(domain_id):
     try:
         user_supabase = get_client_for_request()
         user_id = _extract_user_id_from_request()
-        erp_config = get_config_from_db_secure(user_supabase, user_id)
+        erp_config = get_cached_config(user_supabase, user_id)
         data = request.json
         entity_label, fields = data.get('label'), data.get('fields')
         entity_id = entity_label.replace(" ", "")
@@ -1505,7 +1743,7 @@ def update_entity(domain_id, entity_id):
     try:
         user_supabase = get_client_for_request()
         user_id = _extract_user_id_from_request()
-        erp_config = get_config_from_db_secure(user_supabase, user_id)
+        erp_config = get_cached_config(user_supabase, user_id)
         domain = next((d for d in erp_config['domains'] if d['id'] == domain_id), None)
         if not domain or entity_id not in domain['entities']:
             return jsonify({"error": "Entity not found"}), 404
@@ -1553,11 +1791,16 @@ def delete_entity(domain_id, entity_id):
     try:
         user_supabase = get_client_for_request()
         user_id = _extract_user_id_from_request()
-        erp_config = get_config_from_db_secure(user_supabase, user_id)
+        erp_config = get_cached_config(user_supabase, user_id)
         domain = next((d for d in erp_config['domains'] if d['id'] == domain_id), None)
         if not domain or entity_id not in domain['entities']:
             return jsonify({"error": "Entity not found"}), 404
-        user_supabase.rpc('execute_sql', {'sql_statement': f'DROP TABLE IF EXISTS public."{entity_id}";'}).execute()
+        # DROP before touching the config: a failed DROP leaves the entity in place
+        # instead of an orphaned table, and a deferred DROP can never hit a table
+        # re-created under the same id.
+        user_supabase.rpc('execute_sql', {
+            'sql_statement': f'DROP TABLE IF EXISTS public.{_quote_identifier(entity_id)} CASCADE;'
+        }).execute()
         del domain['entities'][entity_id]
         save_config_to_db_secure(user_supabase, user_id, erp_config)
         socketio.emit('config_changed')
@@ -1565,19 +1808,39 @@ def delete_entity(domain_id, entity_id):
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+
+def _quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
 # --- AI Endpoints ---
 
+# Upper bound on concurrent PostgREST requests when loading every entity table.
+ERP_DATA_FETCH_WORKERS = 16
+
+
+def _fetch_entity_rows(user_supabase, entity_id):
+    try:
+        response = user_supabase.table(entity_id).select("*").execute()
+        return response.data
+    except Exception:
+        return []
+
+
 def get_all_erp_data(user_supabase, user_id):
-    erp_config = get_config_from_db_secure(user_supabase, user_id)
-    full_state = {}
-    for domain_config in erp_config.get("domains", []):
-        for entity_id in domain_config.get("entities", {}):
-            try:
-                response = user_supabase.table(entity_id).select("*", count='exact').execute()
-                full_state[entity_id] = response.data
-            except Exception:
-                full_state[entity_id] = []
-    return full_state
+    erp_config = get_cached_config(user_supabase, user_id)
+    entity_ids = [
+        entity_id
+        for domain_config in erp_config.get("domains", [])
+        for entity_id in domain_config.get("entities", {})
+    ]
+    if not entity_ids:
+        return {}
+    # Entity tables are independent, so fetch them concurrently; map() keeps
+    # the config order for the prompt/report output.
+    with ThreadPoolExecutor(max_workers=min(ERP_DATA_FETCH_WORKERS, len(entity_ids))) as executor:
+        rows_per_entity = executor.map(lambda entity_id: _fetch_entity_rows(user_supabase, entity_id), entity_ids)
+        return dict(zip(entity_ids, rows_per_entity))
 
 @erp_bp.route("/ai/report", methods=["POST"])
 def handle_ai_report():
@@ -1613,8 +1876,8 @@ Requirements:
 
 User Query: "{user_query}"
 
-Full ERP Data (JSON):
-{json.dumps(current_erp_data, indent=2, default=str)}
+Full ERP Data (one block per entity: `entity[row_count]{{columns}}:` followed by one pipe-delimited row per line):
+{erp_data_to_toon(current_erp_data)}
 
 Begin the report now.
         """.strip()
@@ -1624,27 +1887,42 @@ Begin the report now.
         # openai.api_base = LOCAL_API_BASE
         # openai.api_key = "ollama"
 
-        client = OpenAI(api_key="ollama",base_url=LOCAL_API_BASE)
+        client = get_local_llm_client()
         
         model_to_use = LOCAL_CHAT_MODEL
 
-        completion = client.chat.completions.create(
+        completion_stream = client.chat.completions.create(
             model=model_to_use,
             messages=[
                 {"role": "system", "content": "You are an expert data analyst and auditor for an ERP system."},
                 {"role": "user", "content": reporting_prompt}
             ],
             temperature=0.1,
+            stream=True,
         )
-        report_content = completion.choices[0].message.content
-        return jsonify({"report": report_content})
+
+        # Forward Markdown as the model produces it so the client can render
+        # from the first token instead of waiting for the whole report.
+        def generate_report():
+            try:
+                for chunk in completion_stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+            except Exception as exc:
+                yield f"\n\n**Report generation stopped:** {exc}"
+
+        return Response(stream_with_context(generate_report()), mimetype="text/markdown")
     except Exception as e:
         return jsonify({"error": f"An unexpected error occurred: {e}"}), 500
 
 # --- SocketIO Chat Logic ---
 
-def get_chatbot_system_prompt(user_supabase, user_id):
-    json_instruction = """
+# Static chatbot system prompt. Literal braces are doubled for str.format_map;
+# only the three named slots vary per call.
+CHATBOT_JSON_INSTRUCTION = """
 When you answer, you MUST return *only* valid JSON matching the schema below.
 Never add explanations outside the JSON block.
 
@@ -1655,10 +1933,8 @@ Schema:
   "payload": { "key": "value" }
 }
 """
-    config_context = f"## ERP Schema (The Definitive Source of Truth)\n{json.dumps(get_config_from_db_secure(user_supabase, user_id), indent=2)}"
-    data_context = f"## Sample of Existing Data (For Context on Updates/Deletes)\n{json.dumps(get_all_erp_data(user_supabase, user_id), indent=2, default=str)}"
 
-    return f"""
+CHATBOT_PROMPT_TEMPLATE = """
 You are an AI assistant inside an ERP application. Your primary job is to translate natural language into structured JSON actions.
 
 --- How to Guide Users (Schema Management) ---
@@ -1703,63 +1979,204 @@ If the user asks how to perform actions related to changing the ERP structure (d
      }}
      **2. For `update` or `delete` intents (VERY IMPORTANT):**
    - Users will identify records using human-readable text (e.g., a work order number or item name), NOT the database UUID `id`.
-   - Your first job is to find the correct record in the 'Sample of Existing Data' to get its UUID `id`.
-   - You MUST include this UUID `id` in the `payload` of your final JSON response. The action will fail without it.
+   - Do NOT invent an `id`. Instead put the schema field the user referred to in `identifier_field` and the value they gave in `identifier_value`; the application looks up the record.
    --- UPDATE/DELETE EXAMPLE ---
-   - **Sample Data Context:**
-     ```json
-     {{
-       "WorkOrder": [
-         {{ "id": "a1b2c3d4-e5f6-7890-a1b2-c3d4e5f67890", "work_order": "WO-2025-001", "status": "Planned" }}
-       ]
-     }}
-     ```
    - **User Query:** "Update the status of work order WO-2025-001 to 'In Progress'."
-   - **Your JSON Response (after finding the ID from the context):**
+   - **Your JSON Response:**
      ```json
      {{
        "intent": "update",
        "entity": "WorkOrder",
        "payload": {{
-         "id": "a1b2c3d4-e5f6-7890-a1b2-c3d4e5f67890",
+         "identifier_field": "work_order",
+         "identifier_value": "WO-2025-001",
          "status": "In Progress"
        }}
      }}
      ```
    ---
-**2. When the user wants to UPDATE or DELETE a record:**
-   - Your goal is to identify an EXISTING row to modify. Use the 'Sample of Existing Data' for context.
+**3. When one request covers SEVERAL records:**
+   - Bulk create: `"payload": {{ "rows": [ {{ ...record 1... }}, {{ ...record 2... }} ] }}`
+   - Same change on several records: `"payload": {{ "identifier_field": "work_order", "identifier_values": ["WO-001", "WO-002"], "status": "Closed" }}`
+   - Different changes per record: `"payload": {{ "rows": [ {{ "identifier_field": "work_order", "identifier_value": "WO-001", ...changes... }}, ... ] }}`
+   - Bulk delete: `"payload": {{ "identifier_field": "work_order", "identifier_values": ["WO-001", "WO-002"] }}`
 {json_instruction}
 --- System Context ---
 {config_context}
-{data_context}
 """
 
+
+# Rendered chatbot system prompts keyed on (user_id, config updated_at), falling
+# back to a digest of the config when updated_at is unknown. A changed config
+# simply misses and stale entries age out.
+CHATBOT_PROMPT_CACHE_SIZE = 128
+_chatbot_prompt_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_chatbot_prompt_cache_lock = threading.Lock()
+
+
+def get_chatbot_system_prompt(user_supabase, user_id):
+    """
+    System message for the chatbot. It only depends on the ERP schema, so it
+    stays byte-identical across turns and the provider can reuse its prompt
+    cache. Records are resolved server-side, so no row data is included.
+    """
+    erp_config = get_cached_config(user_supabase, user_id)
+    config_json = None
+    version = _cached_config_version(user_id)
+    if version is None:
+        config_json = fast_json_dumps(erp_config)
+        version = hashlib.md5(config_json.encode("utf-8")).hexdigest()
+    cache_key = (user_id, version)
+    with _chatbot_prompt_cache_lock:
+        prompt = _chatbot_prompt_cache.get(cache_key)
+        if prompt is not None:
+            _chatbot_prompt_cache.move_to_end(cache_key)
+            return prompt
+
+    if config_json is None:
+        config_json = fast_json_dumps(erp_config)
+    prompt = CHATBOT_PROMPT_TEMPLATE.format_map({
+        "json_instruction": CHATBOT_JSON_INSTRUCTION,
+        "config_context": f"## ERP Schema (The Definitive Source of Truth)\n{config_json}",
+    })
+    with _chatbot_prompt_cache_lock:
+        _chatbot_prompt_cache[cache_key] = prompt
+        while len(_chatbot_prompt_cache) > CHATBOT_PROMPT_CACHE_SIZE:
+            _chatbot_prompt_cache.popitem(last=False)
+    return prompt
+
+
+# Day-first dates users type in chat ("03-08-2025" or "3-8-25"); same inputs
+# strptime accepted for '%d-%m-%Y' / '%d-%m-%y', parsed in one match.
+_DATE_RE = re.compile(r'^(\d{1,2})-(\d{1,2})-(\d{4}|\d{2})$')
+
+
+def _parse_chat_date(value: str) -> date | None:
+    match = _DATE_RE.match(value)
+    if match is None:
+        return None
+    day, month, year = (int(part) for part in match.groups())
+    if len(match.group(3)) == 2:
+        # POSIX %y pivot: 69-99 -> 19xx, 00-68 -> 20xx.
+        year += 1900 if year >= 69 else 2000
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _entity_date_fields(user_supabase, user_id, entity_id) -> frozenset:
+    """Date-typed field names for entity_id, from an index built once per request."""
+    index = g.get("_date_fields_index") if has_app_context() else None
+    if index is None:
+        index = {}
+        erp_config = get_cached_config(user_supabase, user_id)
+        for domain in erp_config.get('domains', []):
+            for domain_entity_id, entity_config in domain.get('entities', {}).items():
+                index.setdefault(
+                    domain_entity_id,
+                    frozenset(field['name'] for field in entity_config.get('fields', []) if field.get('type') == 'date'),
+                )
+        if has_app_context():
+            g._date_fields_index = index
+    return index.get(entity_id, frozenset())
+
+
 def format_dates_in_payload(user_supabase, user_id, entity_id, payload):
     try:
-        erp_config = get_config_from_db_secure(user_supabase, user_id)
-        domain = next((d for d in erp_config['domains'] if entity_id in d.get('entities', {})), None)
-        if not domain:
-            return payload
-        entity_config = domain['entities'][entity_id]
-        date_fields = {field['name'] for field in entity_config.get('fields', []) if field.get('type') == 'date'}
+        date_fields = _entity_date_fields(user_supabase, user_id, entity_id)
         if not date_fields:
             return payload
 
         for field_name, value in payload.items():
             if field_name in date_fields and isinstance(value, str) and value:
-                try:
-                    dt_object = datetime.strptime(value, '%d-%m-%Y')
-                except ValueError:
-                    try:
-                        dt_object = datetime.strptime(value, '%d-%m-%y')
-                    except ValueError:
-                        continue
-                payload[field_name] = dt_object.strftime('%Y-%m-%d')
+                parsed = _parse_chat_date(value)
+                if parsed is not None:
+                    payload[field_name] = parsed.isoformat()
     except Exception:
         pass
     return payload
 
+
+IDENTIFIER_PAYLOAD_KEYS = ("identifier_field", "identifier_value", "identifier_values")
+
+
+def _lookup_ids_by_identifier(user_supabase, entity, field, values) -> Dict[str, List[str]]:
+    """Map each identifier value to the ids of the rows carrying it, in one query."""
+    response = user_supabase.table(entity).select(f"id,{field}").in_(field, list(values)).execute()
+    matches: Dict[str, List[str]] = defaultdict(list)
+    for row in response.data or []:
+        matches[str(row.get(field))].append(row["id"])
+    return matches
+
+
+def _resolve_record_ids(user_supabase, user_id, entity, payload):
+    """
+    Turn identifier_field/identifier_value(s) in an update/delete payload into
+    the `id`/`ids` keys execute_ai_action works with. Rows in payload.rows are
+    resolved together, one query per identifier field. Returns
+    (payload, error_message); explicit ids are passed through untouched.
+    """
+    entity_config = _find_entity_config(get_cached_config(user_supabase, user_id), entity) or {}
+    field_names = {field.get("name") for field in entity_config.get("fields", [])}
+
+    def split(item):
+        identifier = {key: item[key] for key in IDENTIFIER_PAYLOAD_KEYS if key in item}
+        rest = {key: value for key, value in item.items() if key not in IDENTIFIER_PAYLOAD_KEYS}
+        return rest, identifier
+
+    if isinstance(payload.get("rows"), list):
+        rows, pending = [], defaultdict(list)
+        for row in payload["rows"]:
+            if not isinstance(row, dict):
+                continue
+            row, identifier = split(row)
+            rows.append(row)
+            if row.get("id"):
+                continue
+            if not identifier.get("identifier_field") or identifier.get("identifier_value") in (None, ""):
+                return payload, f"Every row for '{entity}' needs an 'id' or identifier_field/identifier_value."
+            pending[identifier["identifier_field"]].append((row, str(identifier["identifier_value"])))
+        for field, items in pending.items():
+            if field not in field_names:
+                return payload, f"'{field}' is not a field of {entity}."
+            matches = _lookup_ids_by_identifier(user_supabase, entity, field, {value for _, value in items})
+            for row, value in items:
+                if len(matches.get(value, [])) != 1:
+                    found = "No record" if not matches.get(value) else "More than one record"
+                    return payload, f"{found} in '{entity}' has {field} = '{value}'."
+                row["id"] = matches[value][0]
+        return {**payload, "rows": rows}, None
+
+    payload, identifier = split(payload)
+    field = identifier.get("identifier_field")
+    if payload.get("id") or payload.get("ids") or not field:
+        return payload, None
+    if field not in field_names:
+        return payload, f"'{field}' is not a field of {entity}."
+
+    if isinstance(identifier.get("identifier_values"), list):
+        values = list(dict.fromkeys(str(value) for value in identifier["identifier_values"] if value not in (None, "")))
+        if not values:
+            return payload, f"No {field} values were given for '{entity}'."
+        matches = _lookup_ids_by_identifier(user_supabase, entity, field, values)
+        for value in values:
+            if len(matches.get(value, [])) != 1:
+                found = "No record" if not matches.get(value) else "More than one record"
+                return payload, f"{found} in '{entity}' has {field} = '{value}'."
+        return {**payload, "ids": [matches[value][0] for value in values]}, None
+
+    value = identifier.get("identifier_value")
+    if value in (None, ""):
+        return payload, None
+    ids = _lookup_ids_by_identifier(user_supabase, entity, field, [str(value)]).get(str(value), [])
+    if not ids:
+        return payload, f"Could not find a record in '{entity}' with {field} = '{value}'."
+    if len(ids) > 1:
+        return payload, f"More than one record in '{entity}' has {field} = '{value}'. Please be more specific."
+    return {**payload, "id": ids[0]}, None
+
+
 def execute_ai_action(user_supabase, user_id, action: dict):
     try:
         intent = action.get("intent")
@@ -1767,22 +2184,89 @@ def execute_ai_action(user_supabase, user_id, action: dict):
         payload = action.get("payload") or {}
 
         if not intent or not entity:
-            return f"AI response missing required fields (intent, entity): {json.dumps(action)}"
-
-        if intent == "create":
+            return f"AI response missing required fields (intent, entity): {fast_json_dumps(action, default=json_default)}"
+
+        if intent in ("update", "delete"):
+            payload, lookup_error = _resolve_record_ids(user_supabase, user_id, entity, payload)
+            if lookup_error:
+                return f"Cannot {intent}: {lookup_error}"
+
+        if intent == "create" and isinstance(payload.get("rows"), list):
+            rows = [
+                format_dates_in_payload(user_supabase, user_id, entity, row)
+                for row in payload["rows"]
+                if isinstance(row, dict) and row
+            ]
+            if not rows:
+                return "Cannot create: payload.rows is empty."
+            for row in rows:
+                row.setdefault("id", str(uuid.uuid4()))
+            # One insert for the whole batch instead of a round-trip per row.
+            response = user_supabase.table(entity).insert(rows).execute()
+            _invalidate_overview_cache(user_id)
+            _mark_entity_changed(entity)
+            return f"Created {len(response.data or rows)} {entity} records."
+
+        elif intent == "create":
             if not payload:
                 return "Cannot create: payload is empty."
             payload = format_dates_in_payload(user_supabase, user_id, entity, payload)
             if 'id' not in payload:
                 payload["id"] = str(uuid.uuid4())
             response = user_supabase.table(entity).insert(payload).execute()
-            socketio.emit('data_changed', {'entity_id': entity})
+            _invalidate_overview_cache(user_id)
+            _mark_entity_changed(entity)
             return f"Created new {entity} with ID: {response.data[0]['id']}"
 
+        elif intent == "update" and isinstance(payload.get("rows"), list):
+            # Rows with different changes: one UPDATE ... WHERE id IN (...) per distinct
+            # change-set. Never upsert partial rows - PostgREST nulls the missing columns.
+            rows = [
+                format_dates_in_payload(user_supabase, user_id, entity, row)
+                for row in payload["rows"]
+                if isinstance(row, dict) and row.get("id")
+            ]
+            if not rows:
+                return "Cannot update: every row in payload.rows needs an 'id' or identifier_field/identifier_value."
+            groups = OrderedDict()
+            for row in rows:
+                changes = {k: v for k, v in row.items() if k != 'id'}
+                if not changes:
+                    continue
+                group_key = json.dumps(changes, sort_keys=True, default=str)
+                groups.setdefault(group_key, (changes, []))[1].append(row["id"])
+            if not groups:
+                return "Cannot update: No fields to update were provided in payload.rows."
+            updated = 0
+            for changes, record_ids in groups.values():
+                response = user_supabase.table(entity).update(changes).in_('id', record_ids).execute()
+                updated += len(response.data or [])
+            if not updated:
+                return f"Could not find any of the given records in '{entity}' to update."
+            _invalidate_overview_cache(user_id)
+            _mark_entity_changed(entity)
+            return f"Updated {updated} {entity} records."
+
+        elif intent == "update" and isinstance(payload.get("ids"), list):
+            # Same change applied to several records: one UPDATE ... WHERE id IN (...).
+            record_ids = [record_id for record_id in payload["ids"] if record_id]
+            update_data = format_dates_in_payload(user_supabase, user_id, entity, payload)
+            update_data = {k: v for k, v in update_data.items() if k not in ('id', 'ids')}
+            if not record_ids:
+                return "Cannot update: payload.ids is empty."
+            if not update_data:
+                return "Cannot update: No fields to update were provided in the payload."
+            response = user_supabase.table(entity).update(update_data).in_('id', record_ids).execute()
+            if not response.data:
+                return f"Could not find any of the given records in '{entity}' to update."
+            _invalidate_overview_cache(user_id)
+            _mark_entity_changed(entity)
+            return f"Updated {len(response.data)} {entity} records."
+
         elif intent == "update":
             record_id = payload.get("id")
             if not record_id:
-                return "Cannot update: 'id' is missing from payload. Please specify which record to update."
+                return "Cannot update: the payload does not say which record to update."
 
             update_data = format_dates_in_payload(user_supabase, user_id, entity, payload)
             update_data = {k: v for k, v in update_data.items() if k != 'id'}
@@ -1793,24 +2277,44 @@ def execute_ai_action(user_supabase, user_id, action: dict):
             if not response.data:
                 return f"Could not find a record with ID '{record_id}' in '{entity}' to update."
 
-            socketio.emit('data_changed', {'entity_id': entity})
+            _invalidate_overview_cache(user_id)
+            _mark_entity_changed(entity)
             return f"Updated {entity} record: {record_id}"
 
+        elif intent == "delete" and isinstance(payload.get("ids"), list):
+            record_ids = [record_id for record_id in payload["ids"] if record_id]
+            if not record_ids:
+                return "Cannot delete: payload.ids is empty."
+            response = user_supabase.table(entity).delete().in_('id', record_ids).execute()
+            if not response.data:
+                return f"Could not find any of the given records in '{entity}' to delete."
+            _invalidate_overview_cache(user_id)
+            _mark_entity_changed(entity)
+            return f"Deleted {len(response.data)} {entity} records."
+
         elif intent == "delete":
             record_id = payload.get("id")
             if not record_id:
-                return "Cannot delete: 'id' is missing from payload."
+                return "Cannot delete: the payload does not say which record to delete."
             user_supabase.table(entity).delete().eq('id', record_id).execute()
-            socketio.emit('data_changed', {'entity_id': entity})
+            _invalidate_overview_cache(user_id)
+            _mark_entity_changed(entity)
             return f"Deleted {entity} record: {record_id}"
 
         elif intent == "list":
-            response = user_supabase.table(entity).select("*").limit(10).execute()
-            formatted_data = json.dumps(response.data, indent=2, default=str)
+            # Only the schema's own fields; bookkeeping columns just cost tokens
+            # when this reply is replayed as chat history.
+            entity_config = _find_entity_config(get_cached_config(user_supabase, user_id), entity) or {}
+            columns = ["id"] + [field["name"] for field in entity_config.get("fields", []) if field.get("name") and field["name"] != "id"]
+            try:
+                response = user_supabase.table(entity).select(",".join(columns)).limit(10).execute()
+            except Exception:
+                response = user_supabase.table(entity).select("*").limit(10).execute()
+            formatted_data = fast_json_dumps(response.data, default=json_default)
             return f"Listing up to 10 records from {entity}:\n```json\n{formatted_data}\n```"
 
         elif intent == "describe_entity":
-            erp_config = get_config_from_db_secure(user_supabase, user_id)
+            erp_config = get_cached_config(user_supabase, user_id)
             domain = next((d for d in erp_config['domains'] if entity in d.get('entities', {})), None)
             if not domain:
                 return f"I couldn't find an entity named '{entity}' in the ERP configuration."
@@ -1847,46 +2351,102 @@ def handle_ai_interaction(user_supabase, action: dict, user_id: str):
             return action
         return "I'm sorry, I didn't understand that. Could you please rephrase your request?"
 
+
+# Number of prior chat messages replayed to the model on each turn.
+CHAT_HISTORY_WINDOW = 10
+
+# Per-socket state (user id, chat history buffer), keyed by Socket.IO sid and
+# dropped on disconnect so chat content does not outlive the session.
+_SOCKET_SESSIONS: Dict[str, Dict[str, Any]] = {}
+
+
+def _chat_history_buffer(user_supabase, sid, user_id) -> deque:
+    """
+    Recent chat turns for this Socket.IO session. Seeded from chat_history
+    on the first message and kept in memory afterwards.
+    """
+    session_state = _SOCKET_SESSIONS.setdefault(sid, {})
+    history_buffer = session_state.get('chatHistory')
+    if history_buffer is None or session_state.get('chatHistoryUserId') != user_id:
+        history_response = user_supabase.table('chat_history').select('role, content').eq('user_id', user_id).order('created_at', desc=True).limit(CHAT_HISTORY_WINDOW).execute()
+        history_buffer = deque(reversed(history_response.data or []), maxlen=CHAT_HISTORY_WINDOW)
+        session_state['chatHistory'] = history_buffer
+        session_state['chatHistoryUserId'] = user_id
+    return history_buffer
+
+
+def _persist_chat_turn(user_supabase, rows: List[Dict[str, Any]]) -> None:
+    try:
+        user_supabase.table('chat_history').insert(rows).execute()
+    except Exception as exc:
+        logging.warning("Failed to persist chat history: %s", exc)
+
+
+@socketio.on("connect")
+def handle_connect(auth=None):
+    # The handshake carries the versatileErpUserId cookie; put the socket in that user's room.
+    user_id = _extract_user_id_from_request()
+    if user_id:
+        join_room(user_id)
+
+
+@socketio.on("disconnect")
+def handle_disconnect():
+    _SOCKET_SESSIONS.pop(request.sid, None)
+
+
+@socketio.on("register")
+def handle_register(data):
+    """Join the caller's user room (for clients whose handshake had no user cookie)."""
+    user_id = (data or {}).get("userId")
+    if not user_id:
+        return
+    _SOCKET_SESSIONS.setdefault(request.sid, {})['userId'] = user_id
+    join_room(user_id)
+
+
 @socketio.on("chat_message")
 def handle_chat(data):
     user_message = data.get("message")
     user_id = data.get("userId")
     if not all([user_message, user_id]):
-        socketio.emit("ai_reply", {"text": "Error: Message or User ID is missing."})
+        socketio.emit("ai_reply", {"text": "Error: Message or User ID is missing."}, to=request.sid)
         return
 
-    socketio.server.environ.setdefault(request.sid, {})
-    socketio.server.environ[request.sid]['userId'] = user_id
+    _SOCKET_SESSIONS.setdefault(request.sid, {})['userId'] = user_id
 
     try:
         user_supabase = get_client_for_request()
-        history_response = user_supabase.table('chat_history').select('role, content').eq('user_id', user_id).order('created_at', desc=False).limit(10).execute()
-        chat_history = history_response.data
-
-        system_prompt = get_chatbot_system_prompt(user_supabase, user_id)
-        messages = [{"role": "system", "content": system_prompt}] + chat_history + [{"role": "user", "content": user_message}]
-
+        history_buffer = _chat_history_buffer(user_supabase, request.sid, user_id)
+        chat_history = list(history_buffer)
 
         # openai.api_base = LOCAL_API_BASE
         # openai.api_key = "ollama"
 
-
-        client= OpenAI(api_key="ollama",base_url=LOCAL_API_BASE)
+        client = get_local_llm_client()
         model_to_use = LOCAL_CHAT_MODEL
+
+        system_prompt = get_chatbot_system_prompt(user_supabase, user_id)
+        messages = [{"role": "system", "content": system_prompt}] + chat_history + [{"role": "user", "content": user_message}]
         completion = client.chat.completions.create(
             model=model_to_use,
             messages=messages,
             response_format={"type": "json_object"},
         )
-        action = json.loads(completion.choices[0].message.content)
+        action = fast_json_loads(completion.choices[0].message.content)
 
         ai_reply_text = handle_ai_interaction(user_supabase, action, user_id)
 
-        user_supabase.table('chat_history').insert([
-            {'user_id': user_id, 'role': 'user', 'content': user_message},
-            {'user_id': user_id, 'role': 'assistant', 'content': ai_reply_text}
-        ]).execute()
+        turn = [
+            {'role': 'user', 'content': user_message},
+            {'role': 'assistant', 'content': ai_reply_text}
+        ]
+        history_buffer.extend(turn)
 
-        socketio.emit("ai_reply", {"text": ai_reply_text})
+        socketio.emit("ai_reply", {"text": ai_reply_text}, to=request.sid)
+        # Persist after replying; the in-memory buffer already has this turn.
+        socketio.start_background_task(
+            _persist_chat_turn, user_supabase, [{'user_id': user_id, **message} for message in turn]
+        )
     except Exception as e:
-        socketio.emit("ai_reply", {"text": f"An error occurred: {e}"})
+        socketio.emit("ai_reply", {"text": f"An error occurred: {e}"}, to=request.sid)
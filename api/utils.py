@@ -1,21 +1,35 @@
 import asyncio
 import aiohttp
-from openai  import OpenAI
+import atexit
+import contextlib
+from openai  import AsyncOpenAI, OpenAI
 import json
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import hashlib
+import heapq
 import re
 import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass
 from urllib.parse import urlparse
-from threading import Lock, Event
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Lock, Thread
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import zip_longest
+from collections import OrderedDict
 import random
 import logging
+from logging.handlers import RotatingFileHandler
 import pyotp
 from flask_mail import Message
 from flask import current_app
 import os
 import sys
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import httpx
 from flask_mail import Mail
 import pycountry
 from typing import Optional  # <-- Python 3.9 compatibility for Optional[T]
@@ -23,6 +37,7 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 mail = Mail()
+logger = logging.getLogger(__name__)
 
 # =========================
 # === Environment Load  ===
@@ -75,6 +90,38 @@ def resolve_embedding_model(candidate: Optional[str] = None) -> str:
 
 LOCAL_CHAT_MODEL = resolve_chat_model()
 LOCAL_EMBEDDING_MODEL = resolve_embedding_model()
+
+# Connection pool for the local LLM endpoint; keep-alive connections are reused
+# across chat turns instead of reconnecting on every completion.
+LOCAL_LLM_MAX_CONNECTIONS = 100
+LOCAL_LLM_MAX_KEEPALIVE = 50
+_local_llm_client: Optional[OpenAI] = None
+_local_llm_client_lock = Lock()
+
+
+def get_local_llm_client() -> OpenAI:
+    """
+    Process-wide OpenAI client for LOCAL_API_BASE, created on first use.
+
+    Deliberately synchronous: Socket.IO runs in eventlet mode, so handlers are
+    green threads with no asyncio loop to await AsyncOpenAI on, and the worker's
+    monkey-patched sockets let a blocking completion yield to other handlers.
+    """
+    global _local_llm_client
+    if _local_llm_client is None:
+        with _local_llm_client_lock:
+            if _local_llm_client is None:
+                _local_llm_client = OpenAI(
+                    api_key="ollama",
+                    base_url=LOCAL_API_BASE,
+                    http_client=httpx.Client(
+                        limits=httpx.Limits(
+                            max_connections=LOCAL_LLM_MAX_CONNECTIONS,
+                            max_keepalive_connections=LOCAL_LLM_MAX_KEEPALIVE,
+                        )
+                    ),
+                )
+    return _local_llm_client
 # === END NEW CODE ===
 
 # Optional: import local, git-ignored hardcoded secrets if present.
@@ -124,6 +171,119 @@ def resolve_serper_key(passed: Optional[str] = None) -> Optional[str]:
     """
     return passed or os.getenv("SERPER_API_KEY") or _SERPER_HC
 
+
+@dataclass(frozen=True)
+class SearchKeys:
+    """API keys for one search request, resolved once and passed down."""
+    serper: Optional[str]
+    openai: Optional[str]
+    tavily: Optional[str]
+
+    @classmethod
+    def resolve(cls, serper: Optional[str] = None, openai: Optional[str] = None, tavily: Optional[str] = None) -> "SearchKeys":
+        return cls(
+            serper=resolve_serper_key(serper),
+            openai=resolve_openai_key(openai),
+            tavily=resolve_tavily_key(tavily),
+        )
+
+# Use orjson for JSON encode/decode when installed; stdlib json otherwise.
+try:
+    import orjson
+except Exception:
+    orjson = None  # graceful fallback if not installed
+
+from datetime import date, datetime
+from decimal import Decimal
+from flask.json.provider import DefaultJSONProvider
+
+
+def fast_json_loads(data):
+    """Decode a JSON str/bytes payload (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_default(obj):
+    """
+    default= hook for fast_json_dumps. orjson already encodes datetime/date/UUID
+    natively, so in practice this only sees Decimal (numeric columns) and the
+    odd unknown type; the date branch keeps the stdlib fallback's output the same.
+    """
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return str(obj)
+
+
+def fast_json_dumps(obj, default=None) -> str:
+    """Encode obj to a compact JSON string (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj, default=default, separators=(",", ":"))
+
+
+class OrjsonJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson. Datetimes are passed through to
+    Flask's default hook so jsonify output keeps the same shape as before.
+    """
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=kwargs.get("default", self.default), option=option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+def _toon_cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (dict, list)):
+        return fast_json_dumps(value, default=json_default)
+    text = str(value)
+    # Quote anything that would break the row grammar or lose whitespace.
+    if not text or "|" in text or "\n" in text or "\r" in text or text != text.strip() or text[0] == '"':
+        return json.dumps(text)
+    return text
+
+
+def erp_data_to_toon(erp_data: dict) -> str:
+    """
+    Serialise {entity_id: [row, ...]} for LLM prompts in a columnar form:
+
+        entity_id[N]{col1,col2,...}:
+          val|val|...
+
+    Column names are declared once per entity instead of on every row. Entities
+    whose rows do not share one key set are emitted as compact JSON instead.
+    """
+    blocks = []
+    for entity_id, rows in erp_data.items():
+        rows = rows or []
+        if not rows:
+            blocks.append(f"{entity_id}[0]:")
+            continue
+        first = rows[0]
+        columns = list(first.keys()) if isinstance(first, dict) else None
+        column_set = set(columns) if columns is not None else None
+        if columns is None or any(not isinstance(row, dict) or row.keys() != column_set for row in rows):
+            blocks.append(f"{entity_id}[{len(rows)}]: {fast_json_dumps(rows, default=json_default)}")
+            continue
+        lines = [f"{entity_id}[{len(rows)}]{{{','.join(columns)}}}:"]
+        for row in rows:
+            lines.append("  " + "|".join(_toon_cell(row.get(column)) for column in columns))
+        blocks.append("\n".join(lines))
+    return "\n".join(blocks)
+
 # Try to use Google's libphonenumber if available for better validation/formatting.
 try:
     import phonenumbers
@@ -131,6 +291,25 @@ try:
 except Exception:
     phonenumbers = None  # graceful fallback if not installed
 
+# Prefer selectolax's Lexbor parser for page-to-text; it is much faster than
+# BeautifulSoup + html.parser, which remains the fallback.
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except Exception:
+    LexborHTMLParser = None  # graceful fallback if not installed
+
+# ijson decodes a JSON response incrementally, so short lists can be cut off a
+# long payload without building the whole document.
+try:
+    import ijson
+except Exception:
+    ijson = None  # graceful fallback if not installed
+
+try:
+    import brotli
+except Exception:
+    brotli = None  # graceful fallback if not installed
+
 # Complete User-Agent List for Rotation
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -144,100 +323,353 @@ USER_AGENTS = [
 _AIOHTTP_TIMEOUT = aiohttp.ClientTimeout(total=10)  # seconds
 _REQUESTS_TIMEOUT = 12  # seconds
 
+# Shared keep-alive pool for every synchronous call in this module (page fetches
+# from worker threads, Serper searches); requests.Session is safe to share for
+# plain GETs/POSTs. Dropped connections get two quick retries.
+_SYNC_SESSION = requests.Session()
+_SYNC_SESSION.headers.update({'Accept-Encoding': 'gzip, deflate'})
+_SYNC_ADAPTER = HTTPAdapter(pool_connections=64, pool_maxsize=128, max_retries=Retry(total=2, backoff_factor=0.2))
+_SYNC_SESSION.mount('https://', _SYNC_ADAPTER)
+_SYNC_SESSION.mount('http://', _SYNC_ADAPTER)
+
 # Get random user agent
 def get_random_user_agent():
     return random.choice(USER_AGENTS)
 
-# -------------------------
-# Synchronous HTML fetcher
-# -------------------------
-def get_html_sync(link: str):
+_WS_RE = re.compile(r'\s+')
+
+# Subtrees that never contribute visible page text.
+_NON_TEXT_TAGS = ("head", "script", "style", "noscript", "svg")
+# bs4 applies parse_only to top-level tags, so straining on <body> keeps <head>
+# (and everything in it) from ever being built.
+_BODY_STRAINER = SoupStrainer("body")
+
+
+# Visible text kept per page. Validation reads the first few KB and contact
+# extraction the rest, so catalog-sized pages stop being walked past this point;
+# the <footer> (where contacts usually live) is appended when a page is cut.
+PAGE_TEXT_MAX_CHARS = 16384
+FOOTER_TEXT_MAX_CHARS = 2000
+
+
+def _bounded_join(pieces, max_chars: int):
+    """Join text pieces until max_chars is passed; returns (text, truncated)."""
+    parts, total = [], 0
+    for piece in pieces:
+        parts.append(piece)
+        total += len(piece) + 1
+        if total > max_chars:
+            return " ".join(parts), True
+    return " ".join(parts), False
+
+
+def _lexbor_text(html: str, max_text_chars: Optional[int]):
+    tree = LexborHTMLParser(html)
+    for node in tree.css(", ".join(_NON_TEXT_TAGS)):
+        node.decompose()
+    root = tree.body or tree.root
+    if root is None:
+        return tree, ""
+    if max_text_chars is None:
+        return tree, root.text(separator=" ")
+    text, truncated = _bounded_join(
+        (node.text(deep=False) for node in root.traverse(include_text=True) if node.tag == "-text"),
+        max_text_chars,
+    )
+    footer = tree.css_first("footer") if truncated else None
+    if footer is not None:
+        text += " " + footer.text(separator=" ")[:FOOTER_TEXT_MAX_CHARS]
+    return tree, text
+
+
+def _soup_text(html: str, max_text_chars: Optional[int]):
+    tree = BeautifulSoup(html, 'lxml', parse_only=_BODY_STRAINER)
+    if not tree.contents:
+        # Fragment without a <body>; parse it whole.
+        tree = BeautifulSoup(html, 'lxml')
+    for node in tree(list(_NON_TEXT_TAGS)):
+        node.decompose()
+    if max_text_chars is None:
+        return tree, tree.get_text(" ")
+    text, truncated = _bounded_join(tree.strings, max_text_chars)
+    footer = tree.find("footer") if truncated else None
+    if footer is not None:
+        text += " " + footer.get_text(" ")[:FOOTER_TEXT_MAX_CHARS]
+    return tree, text
+
+
+def _clean_html(html: str, max_text_chars: Optional[int] = PAGE_TEXT_MAX_CHARS):
     """
-    Synchronous HTML fetch used by QUICK validator to avoid 'coroutine never awaited'
-    warnings when running from worker threads. Cleans the DOM similarly to async path.
+    Parse a page and return (tree, text): the parsed document (Lexbor tree or
+    BeautifulSoup on lxml) and its visible text with head/script/style removed
+    and whitespace collapsed. Text collection stops after about max_text_chars
+    (None = whole page).
     """
-    headers = {'User-Agent': get_random_user_agent()}
+    tree = None
+    if LexborHTMLParser is not None:
+        try:
+            tree, text = _lexbor_text(html, max_text_chars)
+        except Exception as e:
+            logger.warning("Lexbor parse failed, retrying with BeautifulSoup: %s", e)
+            tree = None
+    if tree is None:
+        tree, text = _soup_text(html, max_text_chars)
+    # One pass: \s already covers newlines, so a separate \n+ pass never matched.
+    return tree, _WS_RE.sub(' ', text).strip()
+
+# Source characters parsed on the first pass, counted from the <body> tag so a
+# heavy <head> does not eat the budget. Validation reads only the first few KB of
+# text, so a large page is parsed in full unless that slice is long enough to
+# validate and already carries a contact (an email address or a tel: link). Phone
+# regex hits alone do not count: SKUs and prices match it, and the real number is
+# usually in the footer.
+_HEAD_BYTES = 16384
+_BODY_TAG_RE = re.compile(r'<body[\s>]', re.IGNORECASE)
+_TEL_LINK_RE = re.compile(r'href\s*=\s*["\']?\s*tel:', re.IGNORECASE)
+
+
+def _clean_page(html: str, full: bool = False):
+    """_clean_html over the first _HEAD_BYTES of the page body, or the whole page when needed."""
+    if full or len(html) <= _HEAD_BYTES:
+        return _clean_html(html)
+    body = _BODY_TAG_RE.search(html)
+    start = body.start() if body else 0
+    if len(html) - start <= _HEAD_BYTES:
+        return _clean_html(html)
+    head = html[start:start + _HEAD_BYTES]
+    tree, text = _clean_html(head)
+    if len(text) >= VALIDATE_PAGE_CHARS and (EMAIL_REGEX.search(text) or _TEL_LINK_RE.search(head)):
+        return tree, text
+    return _clean_html(html)
+
+class _TTLCache:
+    """Thread-safe LRU whose entries expire ttl_seconds after they are stored."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+# Cleaned page text by URL, shared by the sync and async fetchers so a link that
+# shows up twice in one search (or across quick re-runs) is fetched and parsed
+# once. Only the text is kept; callers never use the parse tree.
+HTML_CACHE_SIZE = 512
+HTML_CACHE_TTL_SECONDS = 900
+_HTML_CACHE = _TTLCache(HTML_CACHE_SIZE, HTML_CACHE_TTL_SECONDS)
+
+
+def _cached_page_text(link: str) -> Optional[str]:
+    return _HTML_CACHE.get(link)
+
+
+def _store_page_text(link: str, text: Optional[str]) -> None:
+    if text:
+        _HTML_CACHE.set(link, text)
+
+# Search API results (Serper, Tavily) keyed by endpoint + request payload, so a
+# repeated product/region query costs no credits and no round-trip.
+SEARCH_CACHE_SIZE = 1024
+SEARCH_CACHE_TTL_SECONDS = 7 * 24 * 3600
+_SEARCH_CACHE = _TTLCache(SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL_SECONDS)
+
+
+def _search_cache_key(endpoint: str, payload) -> str:
+    if not isinstance(payload, str):
+        payload = fast_json_dumps(payload)
+    return hashlib.sha256(f"{endpoint}|{payload}".encode("utf-8")).hexdigest()
+
+
+def _cached_search(endpoint: str, key: str):
+    results = _SEARCH_CACHE.get(key)
+    logger.info("[SEARCH CACHE] %s %s", "HIT" if results is not None else "MISS", endpoint)
+    return results
+
+
+# ===== Shared event loop + aiohttp session for page fetching =====
+# aiohttp sessions are bound to one event loop, and asyncio.run() makes a new
+# loop per call, so fetches run on one long-lived background loop instead and
+# keep a single session (connection pool + DNS cache) for the process.
+HTML_FETCH_POOL_SIZE = 64
+HTML_FETCH_PER_HOST = 8
+_FETCH_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_FETCH_LOOP_LOCK = Lock()
+_FETCH_SESSION: Optional[aiohttp.ClientSession] = None
+
+
+def _fetch_loop() -> asyncio.AbstractEventLoop:
+    global _FETCH_LOOP
+    with _FETCH_LOOP_LOCK:
+        if _FETCH_LOOP is None:
+            loop = asyncio.new_event_loop()
+            Thread(target=loop.run_forever, name="html-fetch-loop", daemon=True).start()
+            _FETCH_LOOP = loop
+            atexit.register(_close_fetch_session)
+    return _FETCH_LOOP
+
+
+def run_on_fetch_loop(coro):
+    """Run a fetch coroutine on the shared fetch loop and block for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, _fetch_loop()).result()
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """The process-wide fetch session; only call from coroutines on the fetch loop."""
+    global _FETCH_SESSION
+    if _FETCH_SESSION is None or _FETCH_SESSION.closed:
+        _FETCH_SESSION = aiohttp.ClientSession(
+            timeout=_AIOHTTP_TIMEOUT,
+            connector=aiohttp.TCPConnector(
+                limit=HTML_FETCH_POOL_SIZE,
+                limit_per_host=HTML_FETCH_PER_HOST,
+                ttl_dns_cache=600,
+                use_dns_cache=True,
+            ),
+        )
+    return _FETCH_SESSION
+
+
+def _close_fetch_session():
+    if _FETCH_SESSION is None or _FETCH_SESSION.closed or _FETCH_LOOP is None or not _FETCH_LOOP.is_running():
+        return
     try:
-        r = requests.get(link, headers=headers, timeout=_REQUESTS_TIMEOUT)
-        r.raise_for_status()
-        bs = BeautifulSoup(r.text, 'html.parser')
-        if bs.head:
-            bs.head.decompose()
-        for script in bs(["script", "style"]):
-            script.decompose()
-        text = bs.get_text()
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\n+', '\n', text)
-        text = text.strip()
-        logging.info(f"[SYNC FETCH] OK {link}")
-        return bs, text
-    except Exception as e:
-        logging.error(f"[SYNC FETCH] ERROR {link}: {e}")
-        return None, None
+        asyncio.run_coroutine_threadsafe(_FETCH_SESSION.close(), _FETCH_LOOP).result(timeout=5)
+    except Exception:
+        pass
+
+# Bytes read per page. The supplier-relevance signal is in the first screen of
+# text, not in the scripts and catalog markup further down.
+HTML_MAX_BYTES = 200_000
+_HTML_READ_CHUNK = 8192
+# aiohttp only decodes brotli when the optional brotli package is installed.
+_FETCH_ACCEPT_ENCODING = "gzip, deflate, br" if brotli is not None else "gzip, deflate"
+
+
+def _fetch_headers() -> dict:
+    return {'User-Agent': get_random_user_agent(), 'Accept-Encoding': _FETCH_ACCEPT_ENCODING}
+
+
+async def _read_page(response: aiohttp.ClientResponse) -> str:
+    """Read at most about HTML_MAX_BYTES of the body and decode it without charset sniffing."""
+    buf = bytearray()
+    async for chunk in response.content.iter_chunked(_HTML_READ_CHUNK):
+        buf.extend(chunk)
+        if len(buf) >= HTML_MAX_BYTES:
+            break
+    try:
+        return buf.decode(response.charset or "utf-8", errors="replace")
+    except LookupError:
+        # Unknown charset label in the Content-Type header
+        return buf.decode("utf-8", errors="replace")
 
 # Async HTML fetch function with user-agent rotation
 async def get_html_async(link):
-    headers = {'User-Agent': get_random_user_agent()}
-    async with aiohttp.ClientSession(headers=headers, timeout=_AIOHTTP_TIMEOUT) as session:
-        try:
-            async with session.get(link) as response:
-                text = await response.text()
-                bs = BeautifulSoup(text, 'html.parser')
-                if bs.head:
-                    bs.head.decompose()
-                for script in bs(["script", "style"]):
-                    script.decompose()
-                text = bs.get_text()
-                text = re.sub(r'\s+', ' ', text)
-                text = re.sub(r'\n+', '\n', text)
-                text = text.strip()
-                logging.info(f"[ASYNC FETCH] OK {link}")
-                return bs, text
-        except Exception as e:
-            logging.error(f"[ASYNC FETCH] ERROR {link}: {e}")
-            return None, None
+    cached = _cached_page_text(link)
+    if cached is not None:
+        return None, cached
+    session = await _get_session()
+    try:
+        async with session.get(link, headers=_fetch_headers()) as response:
+            bs, text = _clean_page(await _read_page(response))
+            _store_page_text(link, text)
+            logger.info("[ASYNC FETCH] OK %s", link)
+            return bs, text
+    except Exception as e:
+        logger.error("[ASYNC FETCH] ERROR %s: %s", link, e)
+        return None, None
 
 # ===== NEW: Shared-session async fetching (reduces overhead) =====
-async def _fetch_single_with_session(session: aiohttp.ClientSession, link: str):
+# In-flight cap per batch (matches the connector pool); bigger link lists queue
+# instead of holding hundreds of bodies at once.
+HTML_FETCH_CONCURRENCY = HTML_FETCH_POOL_SIZE
+# Politeness towards any one supplier site: a couple of requests at a time,
+# started at least 50 ms apart.
+HTML_FETCH_HOST_CONCURRENCY = 2
+HTML_FETCH_HOST_INTERVAL_SECONDS = 0.05
+
+
+class _HostThrottle:
+    """Async context manager capping concurrent requests to one host and spacing their starts."""
+
+    def __init__(self, concurrency: int, min_interval: float):
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._min_interval = min_interval
+        self._next_start = 0.0
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        try:
+            now = asyncio.get_running_loop().time()
+            start = max(now, self._next_start)
+            self._next_start = start + self._min_interval
+            if start > now:
+                await asyncio.sleep(start - now)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._semaphore.release()
+        return False
+
+
+async def _fetch_single_with_session(session: aiohttp.ClientSession, link: str, semaphore: Optional[asyncio.Semaphore] = None,
+                                     host_throttle: Optional[_HostThrottle] = None):
+    cached = _cached_page_text(link)
+    if cached is not None:
+        return link, None, cached
     try:
-        async with session.get(link) as response:
-            text = await response.text()
-            bs = BeautifulSoup(text, 'html.parser')
-            if bs.head:
-                bs.head.decompose()
-            for script in bs(["script", "style"]):
-                script.decompose()
-            text = bs.get_text()
-            text = re.sub(r'\s+', ' ', text)
-            text = re.sub(r'\n+', '\n', text)
-            text = text.strip()
-            logging.info(f"[ASYNC SHARED] OK {link}")
-            return link, bs, text
+        async with semaphore or contextlib.nullcontext():
+            async with host_throttle or contextlib.nullcontext():
+                async with session.get(link, headers=_fetch_headers()) as response:
+                    html = await _read_page(response)
+            bs, text = _clean_page(html)
+        _store_page_text(link, text)
+        logger.info("[ASYNC SHARED] OK %s", link)
+        return link, bs, text
     except Exception as e:
-        logging.error(f"[ASYNC SHARED] ERROR {link}: {e}")
+        logger.error("[ASYNC SHARED] ERROR %s: %s", link, e)
         return link, None, None
 
-async def fetch_all_html_async_shared(links):
-    headers = {'User-Agent': get_random_user_agent()}
-    async with aiohttp.ClientSession(headers=headers, timeout=_AIOHTTP_TIMEOUT) as session:
-        tasks = [_fetch_single_with_session(session, link) for link in links]
-        return await asyncio.gather(*tasks)
+def _start_fetches(session: aiohttp.ClientSession, links: list) -> dict:
+    """Start one fetch task per (unique) link on the running loop; returns {link: task}."""
+    semaphore = asyncio.Semaphore(HTML_FETCH_CONCURRENCY)
+    by_host = {}
+    for link in links:
+        host = urlparse(link).hostname or ""
+        by_host.setdefault(host, []).append((host, link))
+    throttles = {host: _HostThrottle(HTML_FETCH_HOST_CONCURRENCY, HTML_FETCH_HOST_INTERVAL_SECONDS) for host in by_host}
+    # Start tasks round-robin across hosts so the global slots are not taken
+    # up by one site's pages; results still come back in input order.
+    tasks = {}
+    for group in zip_longest(*by_host.values()):
+        for item in group:
+            if item is not None:
+                host, link = item
+                tasks[link] = asyncio.ensure_future(_fetch_single_with_session(session, link, semaphore, throttles[host]))
+    return tasks
 
-def prefetch_html_texts(links):
-    """
-    Prefetch HTML texts for a list of links using a single aiohttp session.
-    Returns: dict[str, str] mapping link -> website_text (cleaned). Missing/failed -> not included.
-    """
-    try:
-        results = asyncio.run(fetch_all_html_async_shared(links))
-        texts = {}
-        for link, _bs, text in results:
-            if text:
-                texts[link] = text
-        return texts
-    except Exception as e:
-        logging.error(f"Prefetch error: {e}")
-        return {}
 
 # Fetch all HTML async
 async def fetch_all_html_async(links):
@@ -247,41 +679,57 @@ async def fetch_all_html_async(links):
 
 # Run async tasks (kept for completeness; not used by quick validator anymore)
 def run_async_tasks(links):
-    return asyncio.run(fetch_all_html_async(links))
+    return run_on_fetch_loop(fetch_all_html_async(links))
 
 # Search function to get supplier links (Serper)
 def search(query, pages, location, serper_api_key):
     resolved_serper = resolve_serper_key(serper_api_key)
     if not resolved_serper:
-        logging.error("SERPER_API_KEY missing. Cannot perform quick search.")
+        logger.error("SERPER_API_KEY missing. Cannot perform quick search.")
         return []
 
-    links = []
-    for page in range(0, pages):
-        base_url = "https://google.serper.dev/search"
+    base_url = "https://google.serper.dev/search"
+    headers = {
+        'X-API-KEY': resolved_serper,
+        'Content-Type': 'application/json'
+    }
+
+    def fetch_page(page):
         payload = json.dumps({
             "q": f"{query} supplier in {location} -cart -basket -marketplace -directory -b2b",
             "num": 40,
             "page": page,
             "location": location
         })
-        headers = {
-            'X-API-KEY': resolved_serper,
-            'Content-Type': 'application/json'
-        }
+        cache_key = _search_cache_key(base_url, payload)
+        cached = _cached_search(base_url, cache_key)
+        if cached is not None:
+            return cached
         try:
-            response = requests.request("POST", base_url, headers=headers, data=payload, timeout=_REQUESTS_TIMEOUT)
+            response = _SYNC_SESSION.post(base_url, headers=headers, data=payload, timeout=_REQUESTS_TIMEOUT)
         except Exception as e:
-            logging.error(f"Serper request error: {e}")
-            continue
-        if response.status_code == 200:
-            jsonResponse = response.json()
-            for item in jsonResponse.get("organic", []):
-                if "link" in item:
-                    links.append(item["link"].split('```')[0])  # Remove any trailing ``` from the URL
-        else:
-            logging.error(f"Error fetching search results: {response.status_code}")
-    return links
+            logger.error("Serper request error: %s", e)
+            return []
+        if response.status_code != 200:
+            logger.error("Error fetching search results: %s", response.status_code)
+            return []
+        jsonResponse = response.json()
+        # Remove any trailing ``` from the URL
+        page_links = [item["link"].split('```')[0] for item in jsonResponse.get("organic", []) if "link" in item]
+        if page_links:
+            _SEARCH_CACHE.set(cache_key, page_links)
+        return page_links
+
+    if pages <= 1:
+        return fetch_page(0) if pages == 1 else []
+    # Pages are independent; request them together and merge in page order.
+    with ThreadPoolExecutor(max_workers=pages) as executor:
+        return [link for page_links in executor.map(fetch_page, range(pages)) for link in page_links]
+
+def _site_key(link) -> str:
+    """Host of a link, lowercased, without port or a leading "www." (one supplier per site)."""
+    host = (urlparse(link or "").hostname or "").rstrip(".")
+    return host[4:] if host.startswith("www.") else host
 
 # Function to remove repeating links
 def remove_repeating_links(validated_links):
@@ -289,50 +737,117 @@ def remove_repeating_links(validated_links):
     unique_links = []
 
     for link, contact_details in validated_links:
-        domain = urlparse(link).netloc
+        domain = _site_key(link)
         if domain not in seen_domains:
             seen_domains.add(domain)
             unique_links.append((link, contact_details))
 
     return unique_links
 
+# Marketplaces, directories and other non-supplier sites, matched against a URL's
+# registered name ("alibaba") or registered domain ("business.com").
+B2B_EXCLUDE_DOMAINS = [
+    "alibaba", "indiamart", "amazon", "made-in-china", "globalsources",
+    "tradeindia", "ec21", "dhgate", "tradeeasy", "exportersindia",
+    "ecplaza", "exporthub", "globalsources", "indiaMART", "indiamart",
+    "ekart", "amazon", "walmart", "eBay", "shopify", "bigcommerce",
+    "woocommerce", "etsy", "overstock", "newegg", "aliexpress",
+    "tradekey", "tradeboss", "hktdc", "kompass", "yellowpages",
+    "zoominfo", "yellowbook", "yell", "made-in-india", "manufacturers",
+    "sourcingguides", "globaltrade", "business.com", "connect.in",
+    "exporters.sg", "exporters.eu", "supplierdirectory", "businessdirectory",
+    "b2bmarketplace", "businessexchange", "globalb2b", "b2bcentral",
+    "industrialb2b", "b2bfinders", "b2bconnect", "b2bworld", "businessnetwork",
+    "tradedirect", "bizb2b", "supplychainb2b", "b2bsourcing", "b2bsupplier",
+    "b2bsupplierdirectory", "b2bsuppliers", "b2bmanufacturers",
+    "b2btraders", "b2bwholesale", "b2bexporters", "b2bimporters",
+    "b2bproducts", "b2bservices", "b2bmarket", "b2bsearch", "b2bgateway",
+    "b2bhub", "b2bplatform", "b2bshop", "b2bdirectory", "b2bonline",
+    "b2bportal", "b2bconnectors", "b2bcommerce", "b2bnetwork", "b2bworldwide",
+    "b2bzone", "b2bcentral", "b2binternational", "b2bmarketplace",
+    "b2bsales", "b2bsupplies", "b2bsupplierhub", "b2btrading",
+    "b2bproductsupply", "b2bvendor", "b2bsupplychain", "b2bconnectors",
+    "b2bwholesaler", "b2bexporthub", "b2bimporthub", "accio", "pinterest", "bbc", "cnn", "magicpin", "swiggy", "zomato", "bigbazzar", 
+    "suppliers.com", "supplier.com", "supplierhub.com", "talabat", "248am", "linkedin", "reddit", "facebook", "wikipedia", "forbes", "fairwild"
+]
+B2B_EXCLUDE_WORDS = ["list", "data", "dictionary", "word", "aspx", "pdf", "txt", "doc", "xls", "video", "image"]
+
+_B2B_EXCLUDE_SET = frozenset(d.lower() for d in B2B_EXCLUDE_DOMAINS)
+
+# Word lists up to this size get a generated matcher (see _build_word_matcher).
+_WORD_MATCHER_CODEGEN_MAX = 64
+
+
+def _build_word_matcher(words):
+    """
+    Return a predicate for "any of `words` occurs in a lowercased string". For a
+    short list it is generated as one chained `in` expression, which CPython
+    evaluates faster than a regex alternation; long lists use the regex.
+    """
+    words = sorted({w.lower() for w in words})
+    if not words:
+        return lambda text: False
+    if len(words) > _WORD_MATCHER_CODEGEN_MAX:
+        return re.compile("|".join(map(re.escape, words))).search
+    namespace = {}
+    exec("def contains_word(text):\n    return " + " or ".join(f"{w!r} in text" for w in words), namespace)
+    return namespace["contains_word"]
+
+
+_contains_b2b_word = _build_word_matcher(B2B_EXCLUDE_WORDS)
+
+# Second-level labels under country TLDs (example.co.uk, example.com.au).
+_SECOND_LEVEL_LABELS = frozenset({"ac", "co", "com", "edu", "gov", "net", "or", "org"})
+
+
+def _registered_domain(host: str):
+    """Return (name, domain) for a hostname, e.g. ("alibaba", "alibaba.com") for m.alibaba.com."""
+    labels = host.rstrip(".").split(".")
+    if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in _SECOND_LEVEL_LABELS:
+        labels = labels[-3:]
+    else:
+        labels = labels[-2:]
+    return labels[0], ".".join(labels)
+
+
+# Verdicts per host; search results keep hitting the same few hundred sites.
+@lru_cache(maxsize=4096)
+def _is_b2b_host(host: str) -> bool:
+    name, domain = _registered_domain(host)
+    return name in _B2B_EXCLUDE_SET or domain in _B2B_EXCLUDE_SET
+
+
+def _is_b2b_domain(url: str) -> bool:
+    return _is_b2b_host(urlparse(url).hostname or "")
+
 # Function to exclude B2B websites
 def exclude_b2b_websites(urls):
-    exclude_domains = [
-        "alibaba", "indiamart", "amazon", "made-in-china", "globalsources",
-        "tradeindia", "ec21", "dhgate", "tradeeasy", "exportersindia",
-        "ecplaza", "exporthub", "globalsources", "indiaMART", "indiamart",
-        "ekart", "amazon", "walmart", "eBay", "shopify", "bigcommerce",
-        "woocommerce", "etsy", "overstock", "newegg", "aliexpress",
-        "tradekey", "tradeboss", "hktdc", "kompass", "yellowpages",
-        "zoominfo", "yellowbook", "yell", "made-in-india", "manufacturers",
-        "sourcingguides", "globaltrade", "business.com", "connect.in",
-        "exporters.sg", "exporters.eu", "supplierdirectory", "businessdirectory",
-        "b2bmarketplace", "businessexchange", "globalb2b", "b2bcentral",
-        "industrialb2b", "b2bfinders", "b2bconnect", "b2bworld", "businessnetwork",
-        "tradedirect", "bizb2b", "supplychainb2b", "b2bsourcing", "b2bsupplier",
-        "b2bsupplierdirectory", "b2bsuppliers", "b2bmanufacturers",
-        "b2btraders", "b2bwholesale", "b2bexporters", "b2bimporters",
-        "b2bproducts", "b2bservices", "b2bmarket", "b2bsearch", "b2bgateway",
-        "b2bhub", "b2bplatform", "b2bshop", "b2bdirectory", "b2bonline",
-        "b2bportal", "b2bconnectors", "b2bcommerce", "b2bnetwork", "b2bworldwide",
-        "b2bzone", "b2bcentral", "b2binternational", "b2bmarketplace",
-        "b2bsales", "b2bsupplies", "b2bsupplierhub", "b2btrading",
-        "b2bproductsupply", "b2bvendor", "b2bsupplychain", "b2bconnectors",
-        "b2bwholesaler", "b2bexporthub", "b2bimporthub", "accio", "pinterest", "bbc", "cnn", "magicpin", "swiggy", "zomato", "bigbazzar", 
-        "suppliers.com", "supplier.com", "supplierhub.com", "talabat", "248am", "linkedin", "reddit", "facebook", "wikipedia", "forbes", "fairwild"
-    ]
+    return [url for url in urls if not _is_b2b_domain(url) and not _contains_b2b_word(url.lower())]
+
+# "Email: ... / Phone: ..." lines in a validator's contact_details string. The
+# email stops at a "Phone:" on the same line.
+_CONTACT_EMAIL_RE = re.compile(r"Email:\s*(.*?)\s*(?=Phone:|[\r\n]|$)", re.IGNORECASE)
+_CONTACT_PHONE_RE = re.compile(r"Phone:\s*([^\n\r]+)", re.IGNORECASE)
 
-    filtered_urls = [url for url in urls if not any(domain.lower() in url.lower() for domain in exclude_domains)]
-    filtered_urls = [url for url in filtered_urls if not any(word in url.lower() for word in ["list", "data", "dictionary", "word", "aspx", "pdf", "txt", "doc", "xls", "video", "image"])]
-    return filtered_urls
+
+def _parse_contact(contact_details: Optional[str]):
+    """Return (email, phone) from a contact_details string; None for a missing field."""
+    text = (contact_details or "").replace('```', '')
+    email_match = _CONTACT_EMAIL_RE.search(text)
+    phone_match = _CONTACT_PHONE_RE.search(text)
+    email = email_match.group(1).strip() if email_match else None
+    phone = phone_match.group(1).strip() if phone_match else None
+    return email or None, phone or None
 
 # ===== NEW: quick regex-based contact extraction (fallback before LLM) =====
 EMAIL_REGEX = re.compile(r"[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}", re.IGNORECASE)
 
 # Broader phone regex to capture international, spaces, dots, dashes, parentheses, and '00' intl prefix.
+# The lookbehind stops the engine from restarting (and re-backtracking the
+# quantifier) at every digit inside a run, and skips digits glued to words or
+# URL paths (SKUs, image names).
 PHONE_REGEX = re.compile(
-    r"(?:\+|00)?\s?(?:\d[\s().-]?){6,15}\d",
+    r"(?<![\w/])(?:\+|00)?\s?(?:\d[\s().-]?){6,15}\d",
     re.IGNORECASE
 )
 # Href tel: extractor
@@ -341,8 +856,28 @@ TEL_HREF_REGEX = re.compile(r'href=[\'"]tel:([^\'"]+)[\'"]', re.IGNORECASE)
 FAX_NEAR_REGEX = re.compile(r"fax", re.IGNORECASE)
 PHONE_KEYWORDS = re.compile(r"(phone|tel|telephone|contact|call|office|hq|switchboard)", re.IGNORECASE)
 
+class _KeepCharsTable(dict):
+    """
+    str.translate table that keeps the characters accepted by `keep` and
+    deletes the rest. Entries are filled in lazily (and memoised) per code
+    point, so the whole filter runs inside str.translate's C loop.
+    """
+
+    def __init__(self, keep):
+        super().__init__()
+        self._keep = keep
+
+    def __missing__(self, code):
+        value = code if self._keep(chr(code)) else None
+        self[code] = value
+        return value
+
+
+_DIGITS_ONLY_TABLE = _KeepCharsTable(str.isdigit)
+_PHONE_CHARS_TABLE = _KeepCharsTable(lambda ch: ch in "0123456789+().-" or ch.isspace())
+
 def _digits_only(s: str) -> str:
-    return "".join(ch for ch in s if ch.isdigit())
+    return s.translate(_DIGITS_ONLY_TABLE)
 
 def _normalize_00_to_plus(s: str) -> str:
     s = s.strip()
@@ -350,11 +885,14 @@ def _normalize_00_to_plus(s: str) -> str:
         return "+" + s[2:]
     return s
 
+_MULTI_SPACE_RE = re.compile(r"\s+")
+_STRIP_SPACES = str.maketrans("", "", " ")
+
 def _clean_visible_number(raw: str) -> str:
     # Keep + and digits and common separators/parentheses; normalize multiple spaces
-    cleaned = re.sub(r"[^0-9+\s().-]", "", raw)
+    cleaned = raw.translate(_PHONE_CHARS_TABLE)
     cleaned = _normalize_00_to_plus(cleaned)
-    cleaned = re.sub(r"\s+", " ", cleaned).strip()
+    cleaned = _MULTI_SPACE_RE.sub(" ", cleaned).strip()
     return cleaned
 
 def extract_emails(html_text: str) -> list:
@@ -371,32 +909,54 @@ def extract_emails(html_text: str) -> list:
             out.append(e)
     return out
 
+# Callers read the best candidate and a short LLM shortlist, never the tail.
+PHONE_SHORTLIST_SIZE = 6
+
 def extract_candidate_phones(html_text: str) -> list:
     """
     Return a list of dicts: [{"raw": "...", "clean": "...", "context": "...", "score": int}, ...]
     Scoring: prefer tel: links, numbers near phone keywords; downrank fax; prefer longer numbers and with country codes.
+    Only the best PHONE_SHORTLIST_SIZE candidates are returned, and scanning stops
+    at the first number that is already confident (see _needs_llm_selection).
     """
     if not html_text:
         return []
 
     text = html_text
-    candidates = []
+    # Best candidate per digit sequence (merges near-duplicates as we go)
+    best = {}
+
+    def offer(raw, clean, ctx, score, key):
+        current = best.get(key)
+        if current is None or score > current["score"]:
+            best[key] = {"raw": raw, "clean": clean, "context": ctx, "score": score}
+        return score >= PHONE_CONFIDENT_SCORE and len(key) >= 10
+
+    def shortlist():
+        return heapq.nlargest(PHONE_SHORTLIST_SIZE, best.values(), key=lambda x: x["score"])
 
     # Collect tel: links
     for m in TEL_HREF_REGEX.finditer(text):
         raw = m.group(1)
         clean = _clean_visible_number(raw)
-        if clean:
-            start = max(0, m.start() - 80)
-            end = min(len(text), m.end() + 80)
-            ctx = text[start:end]
-            candidates.append({"raw": raw, "clean": clean, "context": ctx, "score": 5})
+        key = _digits_only(clean)
+        if not key:
+            continue
+        start = max(0, m.start() - 80)
+        end = min(len(text), m.end() + 80)
+        if offer(raw, clean, text[start:end], 5, key):
+            return shortlist()
 
     # Collect general visible patterns
     for m in PHONE_REGEX.finditer(text):
         raw = m.group(0)
         clean = _clean_visible_number(raw)
-        if not clean:
+        key = _digits_only(clean)
+        if not key:
+            continue
+        current = best.get(key)
+        if current is not None and current["score"] >= PHONE_CONFIDENT_SCORE:
+            # Nothing below can outscore it
             continue
         start = max(0, m.start() - 50)
         end = min(len(text), m.end() + 50)
@@ -407,28 +967,18 @@ def extract_candidate_phones(html_text: str) -> list:
             score += 3
         if FAX_NEAR_REGEX.search(ctx):
             score -= 4
-        digits = len(_digits_only(clean))
-        if digits >= 10:
+        if len(key) >= 10:
             score += 1
         if clean.startswith("+"):
             score += 1
 
-        candidates.append({"raw": raw, "clean": clean, "context": ctx, "score": score})
-
-    # Merge near-duplicates by digit equivalence
-    buckets = {}
-    for c in candidates:
-        key = _digits_only(c["clean"])
-        if not key:
-            continue
-        if key not in buckets or c["score"] > buckets[key]["score"]:
-            buckets[key] = c
+        if offer(raw, clean, ctx, score, key):
+            break
 
-    # Return sorted by score desc
-    deduped = list(buckets.values())
-    deduped.sort(key=lambda x: x["score"], reverse=True)
-    return deduped
+    return shortlist()
 
+# search_fuzzy scans every country; regions repeat across a whole search run.
+@lru_cache(maxsize=256)
 def _guess_region_alpha2(region: str) -> Optional[str]:
     try:
         if not region:
@@ -440,14 +990,25 @@ def _guess_region_alpha2(region: str) -> Optional[str]:
         return None
     return None
 
+@lru_cache(maxsize=256)
+def _country_code(name: str) -> str:
+    """Lower-case ISO alpha-2 code for a country name, or '' if it cannot be matched."""
+    try:
+        return pycountry.countries.search_fuzzy(name)[0].alpha_2.lower()
+    except Exception:
+        return ""
+
+# The same number shows up on many pages of one supplier and across a search run.
+@lru_cache(maxsize=4096)
 def _format_with_phonenumbers(number: str, region_alpha2: Optional[str]) -> Optional[str]:
     if phonenumbers is None:
         return None
     try:
         # For parsing, remove (0) optional trunk; lib can mis-parse otherwise.
-        to_parse = number.replace("(0)", "").replace(" ", "")
+        to_parse = number.replace("(0)", "").translate(_STRIP_SPACES)
         parsed = phonenumbers.parse(to_parse, region_alpha2 if region_alpha2 else None)
-        if not phonenumbers.is_possible_number(parsed) or not phonenumbers.is_valid_number(parsed):
+        # is_valid_number already implies a possible length
+        if not phonenumbers.is_valid_number(parsed):
             return None
         return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
     except NumberParseException:
@@ -455,14 +1016,22 @@ def _format_with_phonenumbers(number: str, region_alpha2: Optional[str]) -> Opti
     except Exception:
         return None
 
+# A tel: link (5) or keyword + length + country code already make the best
+# candidate unambiguous; only close calls or short numbers go to the LLM.
+PHONE_CONFIDENT_SCORE = 5
+PHONE_SCORE_GAP = 2
+
 def _needs_llm_selection(cands: list) -> bool:
-    # Trigger LLM if multiple plausible options or the best one looks incomplete (<9 digits)
+    # Trigger LLM if the top two are close or the best one looks incomplete (<9 digits)
     if len(cands) == 0:
         return False
-    if len(cands) > 1:
-        return True
     best = cands[0]
-    if len(_digits_only(best["clean"])) < 9:
+    best_digits = len(_digits_only(best["clean"]))
+    if best["score"] >= PHONE_CONFIDENT_SCORE and best_digits >= 10:
+        return False
+    if len(cands) >= 2 and best["score"] - cands[1]["score"] < PHONE_SCORE_GAP:
+        return True
+    if best_digits < 9:
         return True
     return False
 
@@ -475,7 +1044,7 @@ def _select_phone_via_llm(candidates: list, url: str, region: str, openai_api_ke
         # openai.api_base = LOCAL_API_BASE
         # openai.api_key = "ollama" # Dummy key
 
-        client = OpenAI(api_key="ollama",base_url=LOCAL_API_BASE)
+        client = get_local_llm_client()
         
         model_to_use = LOCAL_CHAT_MODEL
         shortlist = candidates[:6]  # cap to keep prompt small
@@ -498,8 +1067,6 @@ Task:
 Candidates:
 {joined}
 """
-        client= OpenAI(api_key="ollama",base_url=LOCAL_API_BASE)
-        model_to_use = LOCAL_CHAT_MODEL
         resp = client.chat.completions.create(
             model=model_to_use,
             messages=[
@@ -514,7 +1081,7 @@ Candidates:
         out = _clean_visible_number(out)
         return out
     except Exception as e:
-        logging.error(f"LLM phone selection error: {e}")
+        logger.error("LLM phone selection error: %s", e)
         return ""
 
 def extract_contacts_fast(html_text: str) -> str:
@@ -593,22 +1160,12 @@ def get_contact_details_smart(html_text: str, url: str, region: str, openai_api_
 
     return "\n".join(parts).strip()
 
-# Function to validate links using OpenAI (QUICK path now uses SYNC fetch)
-def validate_link(link, product_name, region, openai_api_key):
-    tick = time.time()
-    logging.info(f"[QUICK VALIDATE] fetching {link}")
-    _bs, website_text = get_html_sync(link)
-    if website_text is None:
-        logging.info(f"REJECTED: {link} - Unable to fetch content (sync)")
-        return None
-
-    tock = time.time()
-    logging.info(f"FETCHED HTML OF {link} IN {tock - tick:.2f} SECONDS")
+# Characters of page text the single-link validator sends to the LLM.
+VALIDATE_PAGE_CHARS = 3500
 
-    # Truncate to reduce LLM latency (keeps enough signal)
-    truncated = (website_text or "")[:3500]
-
-    prompt = f"""
+def _supplier_validation_prompt(link: str, product_name: str, region: str, website_text: str) -> str:
+    truncated = (website_text or "")[:VALIDATE_PAGE_CHARS]
+    return f"""
     You are an expert at evaluating website content and you are an expert analyst. Your task is to determine if the website is exclusively about suppliers for the following product: {product_name} in {region}.
 
     Instructions:
@@ -625,97 +1182,225 @@ def validate_link(link, product_name, region, openai_api_key):
     - If not, return: link: None
     """
 
-    try:
-        # openai.api_key = resolve_openai_key(openai_api_key)
 
-        client= OpenAI(api_key="ollama",base_url=LOCAL_API_BASE)
-        model_to_use = LOCAL_CHAT_MODEL
-        response = client.chat.completions.create(
-            model=model_to_use,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant."},
-                {"role": "user", "content": prompt}
-            ]
+# ===== Batched validation: several pre-fetched pages per LLM call =====
+# Kept small enough that a batch fits a default local-model context window.
+VALIDATE_BATCH_SIZE = 4
+VALIDATE_BATCH_INFLIGHT = 4
+VALIDATE_BATCH_PAGE_CHARS = 1500
+_BATCH_VERDICT_RE = re.compile(r"^\W*(\d+)\W+(yes|no)\b", re.IGNORECASE | re.MULTILINE)
+
+_async_llm_client: Optional[AsyncOpenAI] = None
+
+
+def _get_async_llm_client() -> AsyncOpenAI:
+    """AsyncOpenAI client for LOCAL_API_BASE; only use from coroutines on the fetch loop."""
+    global _async_llm_client
+    if _async_llm_client is None:
+        _async_llm_client = AsyncOpenAI(
+            api_key="ollama",
+            base_url=LOCAL_API_BASE,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=LOCAL_LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LOCAL_LLM_MAX_KEEPALIVE,
+                )
+            ),
         )
-        tock = time.time()
-
-        response_content = response.choices[0].message.content.strip()
-        logging.info(f"RAW RESPONSE FOR {link}: {response_content}")
-
-        if "link: None" in response_content:
-            logging.info(f"REJECTED: {link} IN {tock - tick:.2f} SECONDS - {response_content}")
-            return None
-        elif "link:" in response_content:
-            result = response_content.split("link:")[1].strip()
-            logging.info(f"ACCEPTED: {link} IN {tock - tick:.2f} SECONDS")
-            # Smart contacts (regex + optional LLM validation + libphonenumber)
-            contact_details = get_contact_details_smart(website_text, link, region, openai_api_key)
-            return result, contact_details
-        else:
-            logging.info(f"REJECTED: {link} IN {tock - tick:.2f} SECONDS - Invalid response format: {response_content}")
-            return None, None
-
-    except Exception as e:
-        logging.error(f"UNEXPECTED ERROR FOR LINK {link}: {e}")
-        return None, None
-
-# ===== NEW: Validate link from pre-fetched text (no extra HTTP per link) =====
-def validate_link_from_text(link: str, product_name: str, region: str, website_text: str, openai_api_key: str):
-    tick = time.time()
-    if not website_text:
-        logging.info(f"REJECTED: {link} - No pre-fetched content")
-        return None
+    return _async_llm_client
 
-    # Truncate to reduce LLM latency while keeping enough signal
-    truncated = website_text[:3500]
 
-    prompt = f"""
-    You are an expert at evaluating website content and you are an expert analyst. Your task is to determine if the website is exclusively about suppliers for the following product: {product_name} in {region}.
+def _batch_validation_prompt(batch: list, texts: dict, product_name: str, region: str) -> str:
+    pages = "\n\n".join(
+        f"[{i}] URL: {link}\nContent: {texts[link][:VALIDATE_BATCH_PAGE_CHARS]}"
+        for i, link in enumerate(batch, 1)
+    )
+    return f"""
+    You are an expert at evaluating website content and you are an expert analyst. For each numbered website below, determine if it is exclusively about suppliers for the following product: {product_name} in {region}.
 
     Instructions:
-    1. Analyze the HTML content provided.
-    2. Identify if the HTML content is focused on supplying {product_name}.
-    3. Exclude blogs, insights, intelligence, reports, analysis, news, and social media websites.
-    4. Exclude websites if they sell small quantities that means they are not suppliers.
+    1. Identify if the content is focused on supplying {product_name}.
+    2. Exclude blogs, insights, intelligence, reports, analysis, news, and social media websites.
+    3. Exclude websites if they sell small quantities that means they are not suppliers.
 
-    HTML content:
-    {truncated}
+    Websites:
+    {pages}
 
-    Return format:
-    - If the website is about suppliers, return: link: {link}
-    - If not, return: link: None
+    Return format: one line per website, exactly "<number>: yes" if it is a supplier or "<number>: no" if not. No other text.
     """
 
-    try:
-        # openai.api_key = resolve_openai_key(openai_api_key)
 
-        client= OpenAI(api_key="ollama",base_url=LOCAL_API_BASE)
-        model_to_use = LOCAL_CHAT_MODEL
-        response = client.chat.completions.create(
-            model=model_to_use,
+async def _validate_batch_async(batch, texts, product_name, region, openai_api_key, validated, limit, enough):
+    """Validate one batch of pages with a single LLM call, appending accepted suppliers to `validated`."""
+    try:
+        response = await _get_async_llm_client().chat.completions.create(
+            model=LOCAL_CHAT_MODEL,
             messages=[
                 {"role": "system", "content": "You are a helpful assistant."},
-                {"role": "user", "content": prompt}
+                {"role": "user", "content": _batch_validation_prompt(batch, texts, product_name, region)}
             ],
             temperature=0.2
         )
+        content = response.choices[0].message.content or ""
+    except Exception as e:
+        logger.error("BATCH VALIDATION ERROR for %s links: %s", len(batch), e)
+        return
+    verdicts = {int(number): answer.lower() == "yes" for number, answer in _BATCH_VERDICT_RE.findall(content)}
+    for i, link in enumerate(batch, 1):
+        if not verdicts.get(i):
+            logger.info("REJECTED (batched): %s", link)
+            continue
+        if enough.is_set():
+            return
+        # Contact extraction may itself call the LLM; keep it off the loop.
+        contact_details = await asyncio.to_thread(get_contact_details_smart, texts[link], link, region, openai_api_key)
+        validated.append((link, contact_details))
+        logger.info("ACCEPTED (batched): %s", link)
+        if len(validated) >= limit:
+            enough.set()
+
+
+async def _fetch_and_validate_async(links, product_name, region, openai_api_key, limit, batch_size, inflight):
+    texts = {}
+    validated = []
+    enough = asyncio.Event()
+    queue: asyncio.Queue = asyncio.Queue()
+    fetches = _start_fetches(await _get_session(), list(dict.fromkeys(links)))
+
+    async def produce():
+        try:
+            for fetched in asyncio.as_completed(list(fetches.values())):
+                link, _bs, text = await fetched
+                if text:
+                    texts[link] = text
+                    queue.put_nowait(link)
+        finally:
+            for _ in range(inflight):
+                queue.put_nowait(None)  # one end marker per consumer
+
+    async def consume():
+        finished = False
+        while not finished and not enough.is_set():
+            link = await queue.get()
+            if link is None:
+                return
+            # Validate whatever has arrived meanwhile along with it.
+            batch = [link]
+            while len(batch) < batch_size and not queue.empty():
+                link = queue.get_nowait()
+                if link is None:
+                    finished = True
+                    break
+                batch.append(link)
+            await _validate_batch_async(batch, texts, product_name, region, openai_api_key, validated, limit, enough)
+
+    producer = asyncio.ensure_future(produce())
+    waiter = asyncio.ensure_future(enough.wait())
+    pending = {asyncio.ensure_future(consume()) for _ in range(inflight)} | {waiter}
+    while pending - {waiter} and not enough.is_set():
+        _done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    leftovers = [producer, *fetches.values(), *pending]
+    for task in leftovers:
+        task.cancel()
+    await asyncio.gather(*leftovers, return_exceptions=True)
+    return validated[:limit], texts
+
+
+def fetch_and_validate_links(links, product_name: str, region: str, openai_api_key: str, limit: int = 15,
+                             batch_size: int = VALIDATE_BATCH_SIZE, inflight: int = VALIDATE_BATCH_INFLIGHT):
+    """
+    Fetch pages and validate them in batches as they arrive, so LLM calls start
+    on the first pages instead of after the whole prefetch. Stops fetching and
+    validating once `limit` suppliers are accepted.
+    Returns ([(link, contact_details), ...], {link: website_text}).
+    """
+    if not links:
+        return [], {}
+    try:
+        return run_on_fetch_loop(_fetch_and_validate_async(
+            links, product_name, region, openai_api_key, limit, max(1, batch_size), max(1, inflight)
+        ))
+    except Exception as e:
+        logger.error("Fetch-and-validate error: %s", e)
+        return [], {}
 
+# ===== Async per-link validation: one coroutine per link instead of a thread =====
+VALIDATE_ASYNC_CONCURRENCY = 16
+
+async def validate_link_async(link, product_name, region, openai_api_key):
+    """Validate one link against the product and region; runs on the fetch loop."""
+    tick = time.time()
+    _bs, website_text = await get_html_async(link)
+    if website_text is None:
+        logger.info("REJECTED: %s - Unable to fetch content (async)", link)
+        return None
+    try:
+        response = await _get_async_llm_client().chat.completions.create(
+            model=LOCAL_CHAT_MODEL,
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": _supplier_validation_prompt(link, product_name, region, website_text)}
+            ]
+        )
+        tock = time.time()
         response_content = response.choices[0].message.content.strip()
         if "link: None" in response_content:
-            logging.info(f"REJECTED (prefetched): {link}")
+            logger.info("REJECTED: %s IN %.2f SECONDS - %s", link, tock - tick, response_content)
             return None
         elif "link:" in response_content:
             result = response_content.split("link:")[1].strip()
-            # Smart contacts (regex + optional LLM validation + libphonenumber)
-            contact_details = get_contact_details_smart(website_text, link, region, openai_api_key)
+            logger.info("ACCEPTED: %s IN %.2f SECONDS", link, tock - tick)
+            contact_details = await asyncio.to_thread(get_contact_details_smart, website_text, link, region, openai_api_key)
             return result, contact_details
         else:
-            logging.info(f"REJECTED (prefetched): {link} — invalid response format")
+            logger.info("REJECTED: %s IN %.2f SECONDS - Invalid response format: %s", link, tock - tick, response_content)
             return None, None
     except Exception as e:
-        logging.error(f"UNEXPECTED ERROR (prefetched) FOR LINK {link}: {e}")
+        logger.error("UNEXPECTED ERROR FOR LINK %s: %s", link, e)
         return None, None
 
+async def _validate_all_async(links, validated_links, product_name, region, openai_api_key, limit, concurrency):
+    # Only `concurrency` links have a task at any time; the next one is started
+    # as a slot frees up, so an early stop leaves nothing queued behind it.
+    pending_links = iter(links)
+    in_flight = set()
+
+    def start_next():
+        link = next(pending_links, None)
+        if link is not None:
+            in_flight.add(asyncio.ensure_future(validate_link_async(link, product_name, region, openai_api_key)))
+
+    for _ in range(concurrency):
+        start_next()
+    while in_flight and len(validated_links) < limit:
+        done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            try:
+                result = task.result()
+            except Exception as e:
+                logger.error("Exception in async validation: %s", e)
+                result = None
+            if result and len(validated_links) < limit:
+                validated_links.append(result)
+            if len(validated_links) < limit:
+                start_next()
+    for task in in_flight:
+        task.cancel()
+    await asyncio.gather(*in_flight, return_exceptions=True)
+
+def validate_links_async(links, validated_links, product_name, region, openai_api_key, limit: int = 15,
+                         concurrency: int = VALIDATE_ASYNC_CONCURRENCY):
+    """
+    Validate links as coroutines on the shared fetch loop (at most `concurrency` in flight),
+    appends results to validated_links and cancels the rest once `limit` is reached.
+    """
+    if not links:
+        return
+    try:
+        run_on_fetch_loop(_validate_all_async(links, validated_links, product_name, region, openai_api_key, limit, max(1, concurrency)))
+    except Exception as e:
+        logger.error("Exception in async validation: %s", e)
+
 # (Kept for compatibility if referenced elsewhere)
 def get_contact_details(html_content, openai_api_key):
     """
@@ -735,7 +1420,7 @@ def get_contact_details(html_content, openai_api_key):
 
     try:
         # openai.api_key = resolve_openai_key(openai_api_key)
-        client= OpenAI(api_key="ollama",base_url=LOCAL_API_BASE)
+        client = get_local_llm_client()
         model_to_use = LOCAL_CHAT_MODEL
         response = client.chat.completions.create(
             model=model_to_use,
@@ -747,48 +1432,9 @@ def get_contact_details(html_content, openai_api_key):
         contact_details = response.choices[0].message.content.strip()
         return contact_details
     except Exception as e:
-        logging.error(f"Error getting contact details: {e}")
+        logger.error("Error getting contact details: %s", e)
         return ""
 
-# ===== FIXED: Do not wait for all threads when we reach the target; cancel remaining =====
-def run_threads_and_async(validate_link_func, links, validated_links, product_name, region, openai_api_key, max_workers: int = None):
-    lock = Lock()
-    stop_event = Event()
-
-    if max_workers is None:
-        max_workers = min(32, max(4, len(links) or 1))
-
-    def worker(link):
-        if stop_event.is_set():
-            return None
-        result = validate_link_func(link, product_name, region, openai_api_key)
-        if result:
-            with lock:
-                validated_links.append(result)
-                if len(validated_links) >= 15:  # Stop after collecting enough valid links
-                    stop_event.set()
-        return result
-
-    executor = ThreadPoolExecutor(max_workers=max_workers)
-    futures = [executor.submit(worker, link) for link in links]
-
-    try:
-        for future in as_completed(futures):
-            if stop_event.is_set():
-                break
-            future.result()
-    except Exception as e:
-        logging.error(f"Exception in worker thread: {e}")
-    finally:
-        # Cancel anything not yet started and don't wait for running ones
-        for f in futures:
-            if not f.done():
-                f.cancel()
-        try:
-            executor.shutdown(wait=False, cancel_futures=True)
-        except TypeError:
-            # For Python versions without cancel_futures, fall back:
-            executor.shutdown(wait=False)
 
 # Function to get top producing countries using OpenAI
 def get_top_producing_countries(product_name, openai_api_key):
@@ -805,7 +1451,7 @@ def get_top_producing_countries(product_name, openai_api_key):
     try:
         # openai.api_key = resolve_openai_key(openai_api_key)
 
-        client= OpenAI(api_key="ollama",base_url=LOCAL_API_BASE)
+        client = get_local_llm_client()
         model_to_use = LOCAL_CHAT_MODEL
         resp = client.chat.completions.create(
             model=model_to_use ,
@@ -827,12 +1473,8 @@ def get_top_producing_countries(product_name, openai_api_key):
 
         result = []
         for name in lines:
-            try:
-                # fuzzy-match with pycountry
-                country = pycountry.countries.search_fuzzy(name)[0]
-                code = country.alpha_2.lower()
-            except Exception:
-                code = ""
+            # fuzzy-match with pycountry
+            code = _country_code(name)
 
             flag = f"https://flagcdn.com/w20/{code}.png" if code else ""
             result.append({
@@ -856,40 +1498,43 @@ def extract_company_name(url):
     company_name = domain_parts[0].capitalize()
     return company_name
 
+_LOG_BAR = "=" * 94
+
+
+def _log_banner(title: str, items=()):
+    """Log a bar-framed title followed by items (one per line) as a single record."""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    lines = [_LOG_BAR, title, _LOG_BAR]
+    if items:
+        lines.extend(map(str, items))
+        lines.append(_LOG_BAR)
+    logger.info("\n".join(lines))
+
 # ===== UPDATED: Main search function for suppliers (Serper/legacy) — stays fast; no prefetch =====
 def search_suppliers(product_name, region, serper_api_key, openai_api_key):
     log_filename = setup_logging(product_name, region)
     start_time = time.time()
 
-    resolved_serper = resolve_serper_key(serper_api_key)
-    if not resolved_serper:
+    keys = SearchKeys.resolve(serper=serper_api_key, openai=openai_api_key)
+    if not keys.serper:
         logging.error("SERPER_API_KEY missing. Quick search cannot proceed.")
         return []
 
-    links = search(product_name, 1, region, resolved_serper)
-    logging.info("==============================================================================================")
-    logging.info(f"{len(links)} LINKS FOUND FOR '{product_name.upper()}' IN '{region.upper()}'")
-    logging.info("==============================================================================================")
-    for link in links:
-        logging.info(str(link))
-    logging.info("==============================================================================================")
+    links = search(product_name, 1, region, keys.serper)
+    _log_banner(f"{len(links)} LINKS FOUND FOR '{product_name.upper()}' IN '{region.upper()}'", links)
 
     filtered_links = exclude_b2b_websites(links)
-    logging.info("==============================================================================================")
-    logging.info(f"{len(filtered_links)} LINKS FOUND FOR '{product_name}' IN '{region}' AFTER B2B FILTERING")
-    logging.info("==============================================================================================")
-    for link in filtered_links:
-        logging.info(str(link))
+    _log_banner(f"{len(filtered_links)} LINKS FOUND FOR '{product_name}' IN '{region}' AFTER B2B FILTERING", filtered_links)
 
     # IMPORTANT: Do NOT prefetch here. Validate per-link and stop early at 10 to keep quick mode fast.
     validated_links = []
-    run_threads_and_async(
-        validate_link,
+    validate_links_async(
         filtered_links,
         validated_links,
         product_name,
         region,
-        resolve_openai_key(openai_api_key)
+        keys.openai
     )
 
     validated_links = remove_repeating_links(validated_links)
@@ -902,63 +1547,89 @@ def search_suppliers(product_name, region, serper_api_key, openai_api_key):
             continue
         company_name = extract_company_name(url)
 
-        # Clean up contact details
-        contact_details_clean = (contact_details or "").replace('```', '').strip()
-        email = ""
-        phone = ""
-        if "Email:" in contact_details_clean:
-            email_part = contact_details_clean.split('Email:')[1]
-            if "Phone:" in email_part:
-                email = email_part.split('Phone:')[0].strip()
-            else:
-                email = email_part.strip()
-        if "Phone:" in contact_details_clean:
-            phone = contact_details_clean.split('Phone:')[1].strip()
+        email, phone = _parse_contact(contact_details)
 
         result_list.append({
             "name": company_name,
             "url": url,
-            "email": email,
-            "phone": phone
+            "email": email or "",
+            "phone": phone or ""
         })
 
     elapsed_time = end_time - start_time
     elapsed_time_str = f"{elapsed_time:.2f} seconds"
 
-    logging.info("==============================================================================================")
-    logging.info(f"TOTAL TIME TAKEN: {elapsed_time_str}")
-    logging.info("==============================================================================================")
-    logging.info(f"{len(validated_links)} VALIDATED FOR '{product_name}' IN '{region}'")
-    logging.info("==============================================================================================")
-    for link, _ in validated_links:
-        logging.info(str(link))
-    logging.info("==============================================================================================")
+    _log_banner(f"TOTAL TIME TAKEN: {elapsed_time_str}")
+    _log_banner(f"{len(validated_links)} VALIDATED FOR '{product_name}' IN '{region}'", [link for link, _ in validated_links])
 
     return result_list  # Return the list of suppliers
 
+# Search logs go to one rotating file plus stdout (for `az webapp log tail`).
+# The handlers are installed once per process; each search tags its lines with
+# a request id and its product/region through a context variable instead.
+SEARCH_LOG_FILE = os.path.join("logs", "search.log")
+SEARCH_LOG_MAX_BYTES = 50_000_000
+SEARCH_LOG_BACKUP_COUNT = 10
+_NO_SEARCH_CONTEXT = {"request_id": "-", "product": "-", "region": "-"}
+_search_log_context: ContextVar[dict] = ContextVar("search_log_context", default=_NO_SEARCH_CONTEXT)
+_search_logging_lock = Lock()
+_search_logging_installed = False
+
+
+class _SearchContextFilter(logging.Filter):
+    """Copies the current search's request id, product and region onto each record."""
+
+    def filter(self, record):
+        context = _search_log_context.get()
+        record.request_id = context["request_id"]
+        record.product = context["product"]
+        record.region = context["region"]
+        return True
+
+
+def _install_search_logging():
+    global _search_logging_installed
+    with _search_logging_lock:
+        if _search_logging_installed:
+            return
+        os.makedirs(os.path.dirname(SEARCH_LOG_FILE), exist_ok=True)
+        formatter = logging.Formatter(
+            '%(asctime)s %(levelname)s [%(request_id)s %(product)s/%(region)s]: %(message)s [in %(pathname)s:%(lineno)d]'
+        )
+        context_filter = _SearchContextFilter()
+        root = logging.getLogger()
+        for handler in (
+            RotatingFileHandler(SEARCH_LOG_FILE, maxBytes=SEARCH_LOG_MAX_BYTES, backupCount=SEARCH_LOG_BACKUP_COUNT),
+            logging.StreamHandler(sys.stdout),
+        ):
+            handler.setFormatter(formatter)
+            handler.addFilter(context_filter)
+            root.addHandler(handler)
+        root.setLevel(logging.INFO)
+        _search_logging_installed = True
+
+
 # Logging setup function (to both file and stdout for Azure log tail)
 def setup_logging(product_name, region):
-    log_time = time.strftime('%Y-%m-%d-%H-%M-%S')
-    log_filename = f"logs/{product_name}-{region}-{log_time}.log"
-
-    if not os.path.exists("logs"):
-        os.makedirs("logs")
-
-    root = logging.getLogger()
-    # Clear existing handlers to avoid duplicate lines across requests
-    for h in list(root.handlers):
-        root.removeHandler(h)
-
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]',
-        handlers=[
-            logging.FileHandler(log_filename),
-            logging.StreamHandler(sys.stdout)  # ensure visibility in `az webapp log tail`
-        ]
-    )
-
-    return log_filename
+    _install_search_logging()
+    _search_log_context.set({"request_id": uuid.uuid4().hex[:12], "product": product_name, "region": region})
+    return SEARCH_LOG_FILE
+
+# Search results handed to the component-suggestion prompt.
+PRODUCT_COMPONENT_RESULTS = 3
+
+
+def _first_organic_results(response, count: int) -> list:
+    """The first `count` items of a Serper response's "organic" list, decoded lazily when ijson is installed."""
+    if ijson is None:
+        return fast_json_loads(response.content).get('organic', [])[:count]
+    response.raw.decode_content = True  # let urllib3 undo gzip/deflate
+    items = []
+    for item in ijson.items(response.raw, 'organic.item', use_float=True):
+        items.append(item)
+        if len(items) == count:
+            break
+    return items
 
 # Function to search product components
 def search_product_components(product_name, serper_api_key):
@@ -970,19 +1641,64 @@ def search_product_components(product_name, serper_api_key):
     url = "https://google.serper.dev/search"
     headers = {"X-API-KEY": resolved_serper, "Content-Type": "application/json"}
     payload = {"q": f"{product_name} components list"}
+    cache_key = _search_cache_key(url, payload)
+    cached = _cached_search(url, cache_key)
+    if cached is not None:
+        return cached
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=_REQUESTS_TIMEOUT)
+        with _SYNC_SESSION.post(url, json=payload, headers=headers, stream=True, timeout=_REQUESTS_TIMEOUT) as response:
+            if response.status_code != 200:
+                logging.error(f"Error fetching product components for {product_name}: {response.status_code}")
+                return []
+            organic = _first_organic_results(response, PRODUCT_COMPONENT_RESULTS)
     except Exception as e:
         logging.error(f"Error fetching product components for {product_name}: {e}")
         return []
-    if response.status_code == 200:
-        search_results = response.json()
-        return search_results.get('organic', [])[:3]
-    else:
-        logging.error(f"Error fetching product components for {product_name}: {response.status_code}")
-        return []
+    if organic:
+        _SEARCH_CACHE.set(cache_key, organic)
+    return organic
+
+# Completed LLM answers keyed by model + messages + sampling options, so repeat
+# component lookups and supplier summaries skip the round-trip.
+LLM_CACHE_SIZE = 1024
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 3600
+_LLM_CACHE = _TTLCache(LLM_CACHE_SIZE, LLM_CACHE_TTL_SECONDS)
+
+
+def _llm_cache_key(model: str, messages: list, kwargs: dict) -> str:
+    return hashlib.blake2b(
+        fast_json_dumps([model, messages, kwargs]).encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+def cached_chat_completion(model: str, messages: list, **kwargs) -> str:
+    """
+    chat.completions.create on the shared local client, returning the message
+    content. Non-empty answers are memoised for LLM_CACHE_TTL_SECONDS.
+    """
+    key = _llm_cache_key(model, messages, kwargs)
+    content = _LLM_CACHE.get(key)
+    if content is not None:
+        return content
+
+    response = get_local_llm_client().chat.completions.create(model=model, messages=messages, **kwargs)
+    content = (response.choices[0].message.content or "").strip()
+    if content:
+        _LLM_CACHE.set(key, content)
+    return content
+
+async def cached_chat_completion_async(model: str, messages: list, **kwargs) -> str:
+    """cached_chat_completion on the async client; only call from coroutines on the fetch loop."""
+    key = _llm_cache_key(model, messages, kwargs)
+    content = _LLM_CACHE.get(key)
+    if content is not None:
+        return content
+
+    response = await _get_async_llm_client().chat.completions.create(model=model, messages=messages, **kwargs)
+    content = (response.choices[0].message.content or "").strip()
+    if content:
+        _LLM_CACHE.set(key, content)
+    return content
 
-# Function to get AI suggestions for components
 def get_gpt_suggestions(main_product, openai_api_key, serper_api_key):
     search_results = search_product_components(main_product, serper_api_key)
     if not search_results:
@@ -990,17 +1706,15 @@ def get_gpt_suggestions(main_product, openai_api_key, serper_api_key):
     try:
         # openai.api_key = resolve_openai_key(openai_api_key)
 
-        client= OpenAI(api_key="ollama",base_url=LOCAL_API_BASE)
         model_to_use = LOCAL_CHAT_MODEL
-        response = client.chat.completions.create(
-            model=model_to_use,
-            messages=[
+        suggestions = cached_chat_completion(
+            model_to_use,
+            [
                 {"role": "system", "content": "You are an assistant. Only list the components needed to build the product. Do not add any introductory or closing sentences."},
                 {"role": "user", "content": f"Provide a list of components needed to build a {main_product} based on these search results: {search_results}."}
             ],
             max_tokens=150
         )
-        suggestions = response['choices'][0]['message']['content'].strip()
         components = [line.replace('**', '').strip() for line in suggestions.split('\n') if line.strip()]
         return components if components else ["No components found. Please check your product name."]
     except Exception as e:
@@ -1022,7 +1736,8 @@ except Exception:
     except Exception:
         TavilyClient = None
 
-def tavily_search_links(product_name: str, region: str, tavily_api_key: str, depth: str = "basic", max_results: int = 25) -> list:
+def tavily_search_links(product_name: str, region: str, tavily_api_key: str, depth: str = "basic", max_results: int = 25,
+                        serper_api_key: Optional[str] = None) -> list:
     """
     Use Tavily Search API to get candidate supplier URLs.
     We filter B2B/social domains locally using exclude_b2b_websites().
@@ -1031,20 +1746,27 @@ def tavily_search_links(product_name: str, region: str, tavily_api_key: str, dep
     resolved_key = resolve_tavily_key(tavily_api_key)
     links = []
 
+    def serper_fallback():
+        fallback_serper = resolve_serper_key(serper_api_key)
+        return search(product_name, 1, region, fallback_serper) if fallback_serper else []
+
     if TavilyClient is None:
         logging.warning("Tavily client not available (package import failed). Falling back to Serper.")
-        fallback_serper = resolve_serper_key(None)
-        return search(product_name, 1, region, fallback_serper) if fallback_serper else []
+        return serper_fallback()
 
     if not resolved_key:
         logging.warning("Tavily API key missing. Falling back to Serper.")
-        fallback_serper = resolve_serper_key(None)
-        return search(product_name, 1, region, fallback_serper) if fallback_serper else []
+        return serper_fallback()
+
+    q = f"bulk suppliers OR wholesale suppliers of {product_name} in {region}"
+    cache_key = _search_cache_key("tavily", {"q": q, "depth": depth, "max_results": max_results})
+    cached = _cached_search("tavily", cache_key)
+    if cached is not None:
+        return list(cached)
 
     try:
         # Per SDK: instantiate with keyword and set manual params explicitly.
         client = TavilyClient(api_key=resolved_key)
-        q = f"bulk suppliers OR wholesale suppliers of {product_name} in {region}"
         logging.info(f"Tavily: search_depth={depth} max_results={max_results}")
         res = client.search(
             query=q,
@@ -1064,64 +1786,16 @@ def tavily_search_links(product_name: str, region: str, tavily_api_key: str, dep
 
         if not links:
             logging.warning("Tavily returned 0 links; falling back to Serper for this query.")
-            fallback_serper = resolve_serper_key(None)
-            return search(product_name, 1, region, fallback_serper) if fallback_serper else []
+            return serper_fallback()
 
         logging.info(f"Tavily returned {len(links)} links before local filtering.")
+        _SEARCH_CACHE.set(cache_key, list(links))
     except Exception as e:
         logging.error(f"Tavily search error: {e}. Falling back to Serper.")
-        fallback_serper = resolve_serper_key(None)
-        return search(product_name, 1, region, fallback_serper) if fallback_serper else []
+        return serper_fallback()
 
     return links
 
-# ===== FIXED: early-stop + explicit shutdown =====
-def run_threads_and_async_with_limit(validate_link_func, links, validated_links, product_name, region, openai_api_key, limit: int = 20, prefetched_texts: dict = None, max_workers: int = None):
-    """
-    Same as run_threads_and_async, but with configurable validated limit.
-    Optionally uses pre-fetched texts to avoid per-link HTTP requests.
-    """
-
-    lock = Lock()
-    stop_event = Event()
-
-    # Default max_workers tuned for I/O-bound work
-    if max_workers is None:
-        max_workers = min(32, max(4, len(links) or 1))
-
-    def worker(link):
-        if stop_event.is_set():
-            return None
-        # Prefer pre-fetched text if provided
-        if prefetched_texts is not None and link in prefetched_texts:
-            result = validate_link_from_text(link, product_name, region, prefetched_texts.get(link, ""), openai_api_key)
-        else:
-            result = validate_link_func(link, product_name, region, openai_api_key)
-        if result:
-            with lock:
-                validated_links.append(result)
-                if len(validated_links) >= limit:
-                    stop_event.set()
-        return result
-
-    executor = ThreadPoolExecutor(max_workers=max_workers)
-    futures = [executor.submit(worker, link) for link in links]
-
-    try:
-        for future in as_completed(futures):
-            if stop_event.is_set():
-                break
-            future.result()
-    except Exception as e:
-        logging.error(f"Exception in worker thread: {e}")
-    finally:
-        for f in futures:
-            if not f.done():
-                f.cancel()
-        try:
-            executor.shutdown(wait=False, cancel_futures=True)
-        except TypeError:
-            executor.shutdown(wait=False)
 
 def _truncate_to_two_sentences(text: str) -> str:
     """
@@ -1135,6 +1809,59 @@ def _truncate_to_two_sentences(text: str) -> str:
     trimmed = " ".join(sentences[:2]).strip()
     return trimmed
 
+# Page text sent to the summariser: the passages that talk about the product and
+# about supplying it, rather than whatever nav/boilerplate comes first.
+SUMMARY_TEXT_BUDGET = 1200
+_SUMMARY_CHUNK_CHARS = 240
+_SUMMARY_KEYWORDS = frozenset({
+    "supplier", "suppliers", "manufacturer", "manufacturers", "wholesale",
+    "wholesaler", "bulk", "oem", "exporter", "exporters", "distributor",
+})
+_WORD_RE = re.compile(r"\w+")
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+def _select_relevant(website_text: str, product_name: str, region: str, budget: int = SUMMARY_TEXT_BUDGET) -> str:
+    """
+    Pick the highest-scoring passages of website_text (by overlap with the
+    product, region and supplier keywords) up to `budget` chars, in page order.
+    """
+    text = website_text or ""
+    if len(text) <= budget:
+        return text
+    terms = _SUMMARY_KEYWORDS | set(_WORD_RE.findall(f"{product_name} {region}".lower()))
+    # Page text has its whitespace collapsed, so sentences (split when very
+    # long) stand in for paragraphs.
+    chunks = [
+        sentence[i:i + _SUMMARY_CHUNK_CHARS]
+        for sentence in _SENTENCE_SPLIT_RE.split(text)
+        for i in range(0, len(sentence), _SUMMARY_CHUNK_CHARS)
+    ]
+    scores = [len(terms.intersection(_WORD_RE.findall(chunk.lower()))) for chunk in chunks]
+    if not any(scores):
+        return text[:budget]
+    picked, used = [], 0
+    for i in sorted(range(len(chunks)), key=lambda i: (-scores[i], i)):
+        if scores[i] == 0 or used >= budget:
+            break
+        if used + len(chunks[i]) <= budget:
+            picked.append(i)
+            used += len(chunks[i]) + 1
+    return " ".join(chunks[i] for i in sorted(picked))
+
+def _supplier_summary_messages(product_name: str, region: str, url: str, website_text: str) -> list:
+    prompt = f"""Write a concise professional summary (1 sentence, max 2) explaining the key reason this page is a relevant bulk supplier for '{product_name}' in '{region}'. Focus on the primary capability, product fit, or scale; avoid fluff or marketing language.
+
+URL: {url}
+
+Page text (truncated):
+{_select_relevant(website_text, product_name, region)}
+"""
+    return [
+        {"role": "system", "content": "You are a procurement assistant. Be concise and specific."},
+        {"role": "user", "content": prompt},
+    ]
+
 def summarise_supplier(product_name: str, region: str, url: str, website_text: str, openai_api_key: str) -> str:
     """
     Produce a concise 1-2 sentence summary describing why this page is a relevant supplier
@@ -1142,28 +1869,109 @@ def summarise_supplier(product_name: str, region: str, url: str, website_text: s
     """
     try:
         # openai.api_key = resolve_openai_key(openai_api_key)
-        client= OpenAI(api_key="ollama",base_url=LOCAL_API_BASE)
-        model_to_use = LOCAL_CHAT_MODEL 
-        prompt = f"""Write a concise professional summary (1 sentence, max 2) explaining the key reason this page is a relevant bulk supplier for '{product_name}' in '{region}'. Focus on the primary capability, product fit, or scale; avoid fluff or marketing language.
+        raw = cached_chat_completion(
+            LOCAL_CHAT_MODEL,
+            _supplier_summary_messages(product_name, region, url, website_text),
+            temperature=0.2,
+        )
+        return _truncate_to_two_sentences(raw)
+    except Exception as e:
+        logging.error(f"Summary generation error for {url}: {e}")
+        return ""
 
-URL: {url}
+async def _summarise_supplier_async(product_name: str, region: str, url: str, website_text: str) -> str:
+    try:
+        raw = await cached_chat_completion_async(
+            LOCAL_CHAT_MODEL,
+            _supplier_summary_messages(product_name, region, url, website_text),
+            temperature=0.2,
+        )
+        return _truncate_to_two_sentences(raw)
+    except Exception as e:
+        logging.error(f"Summary generation error for {url}: {e}")
+        return ""
 
-Page text (truncated):
-{(website_text or '')[:2500]}
+# Pages shorter than this are error pages or JS shells; a summary of them is noise.
+SUMMARY_MIN_TEXT_CHARS = 200
+_SUMMARY_SIGNAL_WORDS = ("supplier", "manufacturer", "wholesale", "export", "distributor")
+
+
+def _has_summary_signal(website_text: str, product_name: str) -> bool:
+    """Cheap check that a page is long enough and mentions the product or supplying at all."""
+    if not website_text or len(website_text) < SUMMARY_MIN_TEXT_CHARS:
+        return False
+    lowered = website_text.lower()
+    return (product_name or "").lower() in lowered or any(word in lowered for word in _SUMMARY_SIGNAL_WORDS)
+
+
+# Summaries are written several pages per LLM call; each page gets a smaller
+# text budget so a batch still fits the local model's context.
+SUMMARY_BATCH_SIZE = 5
+SUMMARY_BATCH_TEXT_BUDGET = 700
+_BATCH_SUMMARY_RE = re.compile(r"^\W*(\d+)\W+(.+)$", re.MULTILINE)
+
+
+async def _summarise_batch_async(product_name: str, region: str, batch: list) -> dict:
+    """One batched LLM call for `batch`; pages the model skipped are summarised singly, concurrently."""
+    pages = "\n\n".join(
+        f"[{i}] URL: {url}\nPage text: {_select_relevant(text, product_name, region, SUMMARY_BATCH_TEXT_BUDGET)}"
+        for i, (url, text) in enumerate(batch, 1)
+    )
+    prompt = f"""For each numbered page below, write a concise professional summary (1 sentence, max 2) explaining the key reason it is a relevant bulk supplier for '{product_name}' in '{region}'. Focus on the primary capability, product fit, or scale; avoid fluff or marketing language.
+
+{pages}
+
+Return format: one line per page, exactly "<number>: <summary>". No other text.
 """
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
+    answers = {}
+    try:
+        content = await cached_chat_completion_async(
+            LOCAL_CHAT_MODEL,
+            [
                 {"role": "system", "content": "You are a procurement assistant. Be concise and specific."},
                 {"role": "user", "content": prompt},
             ],
             temperature=0.2,
         )
-        raw = (resp.choices[0].message.content or "").strip()
-        return _truncate_to_two_sentences(raw)
+        answers = {int(number): text.strip() for number, text in _BATCH_SUMMARY_RE.findall(content)}
     except Exception as e:
-        logging.error(f"Summary generation error for {url}: {e}")
-        return ""
+        logging.error(f"Batch summary error for {len(batch)} pages: {e}")
+
+    summaries, missing = {}, []
+    for i, (url, text) in enumerate(batch, 1):
+        summary = _truncate_to_two_sentences(answers.get(i, ""))
+        if summary:
+            summaries[url] = summary
+        else:
+            missing.append((url, text))
+    if missing:
+        singles = await asyncio.gather(
+            *(_summarise_supplier_async(product_name, region, url, text) for url, text in missing)
+        )
+        summaries.update(zip((url for url, _ in missing), singles))
+    return summaries
+
+def summarise_suppliers_batch(product_name: str, region: str, items: list, openai_api_key: str,
+                              batch_size: int = SUMMARY_BATCH_SIZE) -> dict:
+    """
+    Summarise several (url, website_text) pairs with one LLM call per batch.
+    All batches run concurrently on the fetch loop, so the wait is the slowest
+    batch rather than their sum. Returns {url: summary}.
+    """
+    if not items:
+        return {}
+    batches = [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+
+    async def summarise_all():
+        results = await asyncio.gather(
+            *(_summarise_batch_async(product_name, region, batch) for batch in batches)
+        )
+        summaries = {}
+        for result in results:
+            summaries.update(result)
+        return summaries
+
+    return run_on_fetch_loop(summarise_all())
 
 def search_suppliers_v2(product_name: str, region: str, serper_api_key: str, openai_api_key: str,
                         tavily_api_key: str = None, mode: str = "quick",
@@ -1179,66 +1987,53 @@ def search_suppliers_v2(product_name: str, region: str, serper_api_key: str, ope
     # Logging setup
     log_filename = setup_logging(product_name, region)
     start_time = time.time()
-    logging.info("="*94)
-    logging.info(f"SEARCH_V2 START mode={mode} product='{product_name}' region='{region}'")
-    logging.info("="*94)
+    _log_banner(f"SEARCH_V2 START mode={mode} product='{product_name}' region='{region}'")
+    keys = SearchKeys.resolve(serper=serper_api_key, openai=openai_api_key, tavily=tavily_api_key)
 
     links = []
     if (mode or "").lower() == "quick":
-        serper_resolved = resolve_serper_key(serper_api_key)
-        if not serper_resolved:
+        if not keys.serper:
             logging.error("SERPER_API_KEY missing for quick mode; switching to Tavern basic.")
             # If Serper missing, fallback to Tavily basic
             depth = "basic"
             max_results = 25
-            links = tavily_search_links(product_name, region, tavily_api_key, depth=depth, max_results=max_results)
+            links = tavily_search_links(product_name, region, keys.tavily, depth=depth, max_results=max_results)
             validated_limit = 20
         else:
-            links = search(product_name, 1, region, serper_resolved)
+            links = search(product_name, 1, region, keys.serper)
             validated_limit = 15
             logging.info("Using Serper quick search (legacy).")
     else:
         depth = tavily_depth or ("advanced" if (mode or "").lower() == "advanced" else "basic")
         max_results = tavily_max_results or (40 if depth == "advanced" else 25)
-        links = tavily_search_links(product_name, region, tavily_api_key, depth=depth, max_results=max_results)
+        links = tavily_search_links(product_name, region, keys.tavily, depth=depth, max_results=max_results,
+                                    serper_api_key=keys.serper)
         validated_limit = 20 if depth == "basic" else 25
         logging.info(f"Using Tavily search depth={depth} max_results={max_results}.")
 
-    logging.info("="*94)
-    logging.info(f"{len(links)} CANDIDATES BEFORE FILTERING")
-    for link in links[:100]:
-        logging.info(link)
-    logging.info("="*94)
+    _log_banner(f"{len(links)} CANDIDATES BEFORE FILTERING", links[:100])
 
     # If somehow empty at this point, safety fallback to Serper
     if not links:
         logging.warning("No candidates from primary search path; falling back to Serper.")
-        fallback_serper = resolve_serper_key(serper_api_key)
-        if fallback_serper:
-            links = search(product_name, 1, region, fallback_serper)
+        if keys.serper:
+            links = search(product_name, 1, region, keys.serper)
         if (mode or "").lower() != "quick":
             # keep higher limits if user asked for Standard/Pro
             validated_limit = max(20, validated_limit if 'validated_limit' in locals() else 20)
 
     filtered_links = exclude_b2b_websites(links)
-    logging.info("="*94)
-    logging.info(f"{len(filtered_links)} CANDIDATES AFTER B2B FILTER")
-    logging.info("="*94)
-
-    # ===== Prefetch texts once for all filtered links (shared session) — used for Tavily, OK to keep =====
-    prefetched_texts = prefetch_html_texts(filtered_links)
+    _log_banner(f"{len(filtered_links)} CANDIDATES AFTER B2B FILTER")
 
-    validated_links = []
-    # Use adjustable limit and pre-fetched texts
-    run_threads_and_async_with_limit(
-        validate_link,
+    limit = validated_limit if 'validated_limit' in locals() else 20
+    # Pages are validated several per LLM call as soon as they are fetched; the
+    # fetched texts are kept for the summaries below.
+    validated_links, prefetched_texts = fetch_and_validate_links(
         filtered_links,
-        validated_links,
         product_name,
         region,
-        resolve_openai_key(openai_api_key),
-        limit=validated_limit if 'validated_limit' in locals() else 20,
-        prefetched_texts=prefetched_texts
+        keys.openai,
+        limit=limit
     )
 
     # De-duplicate
@@ -1247,6 +2042,22 @@ def search_suppliers_v2(product_name: str, region: str, serper_api_key: str, ope
     # Build results (add summary for Tavily modes only; keep Quick snappy)
     result_list = []
     is_tavily = (mode or "").lower() in ("basic", "advanced")
+    summaries = {}
+    if is_tavily:
+        # use prefetched text to avoid another fetch
+        summary_items = [
+            (url, prefetched_texts[url]) for url, _ in validated_links
+            if url and "None **Reason:**" not in str(url) and prefetched_texts.get(url)
+        ]
+        worth_summarising = [item for item in summary_items if _has_summary_signal(item[1], product_name)]
+        skipped_summary_empty = len(summary_items) - len(worth_summarising)
+        if skipped_summary_empty:
+            logger.info("Skipped %s summaries for near-empty or off-topic pages", skipped_summary_empty)
+        summary_items = worth_summarising
+        try:
+            summaries = summarise_suppliers_batch(product_name, region, summary_items, keys.openai)
+        except Exception as e:
+            logging.error(f"Error generating summaries: {e}")
 
     for url, contact_details in validated_links:
         if url is None or "None **Reason:**" in str(url):
@@ -1254,19 +2065,9 @@ def search_suppliers_v2(product_name: str, region: str, serper_api_key: str, ope
         company_name = extract_company_name(url)
 
         # Extract email & phone from the contact_details string
-        email_match = re.search(r"Email:\s*([^\n\r]+)", contact_details or "", re.IGNORECASE)
-        phone_match = re.search(r"Phone:\s*([^\n\r]+)", contact_details or "", re.IGNORECASE)
-        email = email_match.group(1).strip() if email_match else None
-        phone = phone_match.group(1).strip() if phone_match else None
+        email, phone = _parse_contact(contact_details)
 
-        summary = ""
-        if is_tavily:
-            try:
-                website_text = prefetched_texts.get(url)  # use prefetched text to avoid another fetch
-                if website_text:
-                    summary = summarise_supplier(product_name, region, url, website_text, openai_api_key)
-            except Exception as e:
-                logging.error(f"Error generating summary for {url}: {e}")
+        summary = summaries.get(url, "")
 
         result_list.append({
             "name": company_name,
@@ -1278,9 +2079,7 @@ def search_suppliers_v2(product_name: str, region: str, serper_api_key: str, ope
 
     end_time = time.time()
     elapsed_time = end_time - start_time
-    logging.info("="*94)
-    logging.info(f"SEARCH_V2 DONE in {elapsed_time:.2f}s; {len(result_list)} validated results")
-    logging.info("="*94)
+    _log_banner(f"SEARCH_V2 DONE in {elapsed_time:.2f}s; {len(result_list)} validated results")
 
     return result_list
 
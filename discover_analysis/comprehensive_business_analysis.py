@@ -11,14 +11,24 @@ This pipeline:
 6. Stores comprehensive results in Supabase suplink_discovered table
 """
 import asyncio
+from bisect import bisect_left
 import csv
 import json
+import re
 from pathlib import Path
+from urllib.parse import urlparse
 from datetime import datetime
-from typing import Dict, List
+from itertools import islice
+from typing import Dict, Iterator, List
 import sys
 import os
 
+# orjson parses the large `results` column several times faster; stdlib json otherwise
+try:
+    import orjson
+except Exception:
+    orjson = None  # graceful fallback if not installed
+
 # Set UTF-8 encoding for Windows compatibility
 if sys.platform == 'win32':
     # Configure UTF-8 for stdout/stderr on Windows
@@ -42,6 +52,12 @@ def safe_print(text):
         # If Unicode fails, print ASCII-safe version
         print(text.encode('ascii', errors='replace').decode('ascii'))
 
+def loads_json(data):
+    """Decode a JSON str/bytes payload (orjson when available)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent))
 
@@ -51,6 +67,79 @@ from services.marketplace_scraper_enhanced import marketplace_scraper_enhanced a
 from services.sentiment_analyzer import sentiment_analyzer
 from services.scoring_supplier_evaluation import supplier_evaluation_scoring
 from services.suplink_db import SuplinkDatabase
+from services.http_client import close_http_client
+
+# Address words that mark a street-level location in _rate_location_quality
+_STREET_INDICATORS = frozenset({
+    'street', 'st', 'avenue', 'ave', 'road', 'rd', 'boulevard', 'blvd', 'drive', 'dr', 'lane', 'ln'
+})
+# Kept out of _LOCATION_SIGNALS on purpose: as a case-insensitive whole-word branch of that
+# pattern it is tried at every position and made the scan about 1.3x slower than this split.
+_LOCATION_TOKEN_SPLIT = re.compile(r'[\s,.]+')
+# One zero-width alternation so a single finditer pass tests every position for every signal
+_LOCATION_SIGNALS = re.compile(
+    r'(?=(?P<zip>\b\d{5}\b)'                        # US ZIP
+    r'|(?P<ca>\b[A-Z]\d[A-Z]\s?\d[A-Z]\d\b)'          # Canadian postal
+    r'|(?P<cityst>[A-Z][a-z]+,\s*[A-Z]{2})'          # City, ST
+    r'|(?P<citycountry>[A-Z][a-z]+,\s*[A-Z][a-z]+))'  # City, Country
+)
+# signal -> (tier, points); only the best signal of each tier counts
+_LOCATION_SIGNAL_WEIGHTS = {
+    'zip': ('postal', 30),
+    'ca': ('postal', 30),
+    'cityst': ('city', 20),
+    'citycountry': ('city', 15),
+}
+# Length thresholds (exclusive) and the score for each bucket they delimit
+_LOCATION_LENGTH_BOUNDS = (15, 30, 50)
+_LOCATION_LENGTH_SCORES = (0, 10, 20, 30)
+
+# Analyses started per host per second; other hosts are never held back
+HOST_MAX_RATE = 2
+HOST_RATE_PERIOD_SECONDS = 1.0
+
+# Completed analyses buffered before one bulk insert into suplink_discovered
+WRITE_BATCH_SIZE = 25
+
+# Businesses analyzed at once; each holds a browser page plus marketplace and sentiment lookups
+DEFAULT_MAX_CONCURRENCY = 5
+
+
+def _url_dedup_key(url: str) -> str:
+    """Key under which two business URLs count as the same website"""
+    return url.rstrip('/').lower()
+
+
+@functools.lru_cache(maxsize=8192)
+def _url_host(url: str) -> str:
+    """Lowercased netloc of a business URL, parsed once per URL for the limiter and favicon"""
+    return urlparse(url).netloc.lower()
+
+
+# Process-local only: the URL is derived from the domain with no network round-trip, so
+# persisting it across runs would save nothing. Revisit if this starts probing the site.
+@functools.lru_cache(maxsize=4096)
+def _favicon_for_domain(domain: str) -> str:
+    """Favicon URL for a domain, resolved once per domain (businesses in a search often share one)"""
+    return favicon_extractor.get_google_favicon_url(domain)
+
+
+class HostRateLimiter:
+    """
+    Spaces out requests to the same host (max_rate per time_period) without a global sleep
+    """
+
+    def __init__(self, max_rate: int = HOST_MAX_RATE, time_period: float = HOST_RATE_PERIOD_SECONDS):
+        self.interval = time_period / max_rate
+        self._next_start = {}  # host -> loop time of the next free slot
+
+    async def wait(self, host: str):
+        """Reserve the next slot for host and sleep until it comes up"""
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next_start.get(host, now))
+        self._next_start[host] = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
 
 
 class ComprehensiveBusinessAnalyzer:
@@ -63,6 +152,11 @@ class ComprehensiveBusinessAnalyzer:
         self.results = []
         self.suplink_db = None  # Lazy initialization
         self.user_id = None  # Store user_id for RLS compliance
+        self.claimed_urls = set()  # URLs already taken by a worker in this run
+        self.existing_urls = set()  # URLs already in suplink_discovered, loaded once per run
+        self.host_limiter = HostRateLimiter()
+        self.pending_writes = []  # completed analyses waiting for the next bulk insert
+        self.flush_lock = None  # asyncio.Lock serializing bulk inserts, created inside the running loop
         self.stats = {
             'total_processed': 0,
             'successful': 0,
@@ -73,22 +167,23 @@ class ComprehensiveBusinessAnalyzer:
             'end_time': None
         }
 
-    def load_data_from_supabase(self, search_id: str = None) -> List[Dict]:
+    def iter_data_from_supabase(self, search_id: str = None) -> Iterator[Dict]:
         """
-        Load business data from Supabase discover_ai_searches table
+        Yield business data from Supabase discover_ai_searches table, one business at a time
 
         Args:
             search_id: Optional - If provided, only load data for this specific search
 
-        Returns:
-            List of business records from Supabase
+        Yields:
+            Business records from Supabase
         """
         if search_id:
             print(f"\n[SUPABASE] Loading data for specific search ID: {search_id}...")
         else:
             print(f"\n[SUPABASE] Loading data from discover_ai_searches table...")
 
-        businesses = []
+        # Searches often return the same supplier; yield each website once
+        seen_urls = set()
 
         try:
             # Query the discover_ai_searches table
@@ -103,7 +198,7 @@ class ComprehensiveBusinessAnalyzer:
                     print(f"[WARNING] No data found for search ID: {search_id}")
                 else:
                     print("[WARNING] No data found in discover_ai_searches table")
-                return []
+                return
 
             # Process each row
             for row in result.data:
@@ -111,8 +206,8 @@ class ComprehensiveBusinessAnalyzer:
                     # Parse the results JSON if it exists
                     results = []
                     if row.get('results'):
-                        if isinstance(row['results'], str):
-                            results = json.loads(row['results'])
+                        if isinstance(row['results'], (str, bytes)):
+                            results = loads_json(row['results'])
                         elif isinstance(row['results'], list):
                             results = row['results']
 
@@ -132,34 +227,48 @@ class ComprehensiveBusinessAnalyzer:
                             'db_location': row.get('country', '')  # Use country as fallback location
                         }
 
-                        # Only add if we have a valid URL
+                        # Only yield if we have a valid URL we haven't yielded yet
                         if business['url'] and business['url'].startswith('http'):
-                            businesses.append(business)
+                            url_key = _url_dedup_key(business['url'])
+                            if url_key not in seen_urls:
+                                seen_urls.add(url_key)
+                                yield business
 
                 except (json.JSONDecodeError, TypeError) as e:
                     print(f"  [WARNING] Error parsing results in row {row.get('id')}: {e}")
                     continue
 
-            print(f"[OK] Loaded {len(businesses)} businesses from Supabase")
-            return businesses
-
         except Exception as e:
             print(f"[ERROR] Error loading from Supabase: {e}")
             import traceback
             traceback.print_exc()
-            return []
 
-    def load_csv_data(self) -> List[Dict]:
+    def load_data_from_supabase(self, search_id: str = None) -> List[Dict]:
         """
-        DEPRECATED: Load and parse CSV data
-        Use load_data_from_supabase() instead
+        Load business data from Supabase discover_ai_searches table
+
+        Args:
+            search_id: Optional - If provided, only load data for this specific search
 
         Returns:
-            List of business records from CSV
+            List of business records from Supabase
+        """
+        businesses = list(self.iter_data_from_supabase(search_id=search_id))
+        print(f"[OK] Loaded {len(businesses)} businesses from Supabase")
+        return businesses
+
+    def iter_csv_data(self) -> Iterator[Dict]:
+        """
+        DEPRECATED: Parse CSV data, yielding one business at a time
+        Use iter_data_from_supabase() instead
+
+        Yields:
+            Business records from CSV
         """
         print(f"\n[CSV] Loading CSV data from: {self.csv_path}")
 
-        businesses = []
+        # Searches often return the same supplier; yield each website once
+        seen_urls = set()
 
         try:
             with open(self.csv_path, 'r', encoding='utf-8') as f:
@@ -168,7 +277,7 @@ class ComprehensiveBusinessAnalyzer:
                 for row in reader:
                     # Parse the results JSON
                     try:
-                        results = json.loads(row['results'])
+                        results = loads_json(row['results'])
 
                         # Extract each business from results
                         for result in results:
@@ -185,22 +294,33 @@ class ComprehensiveBusinessAnalyzer:
                                 'db_location': row.get('country', '')  # Use country as fallback location
                             }
 
-                            # Only add if we have a valid URL
+                            # Only yield if we have a valid URL we haven't yielded yet
                             if business['url'] and business['url'].startswith('http'):
-                                businesses.append(business)
+                                url_key = _url_dedup_key(business['url'])
+                                if url_key not in seen_urls:
+                                    seen_urls.add(url_key)
+                                    yield business
 
                     except json.JSONDecodeError as e:
                         print(f"  [WARNING] Error parsing results JSON in row {row.get('id')}: {e}")
                         continue
 
-            print(f"[OK] Loaded {len(businesses)} businesses from CSV")
-            return businesses
-
         except Exception as e:
             print(f"[ERROR] Error loading CSV: {e}")
             import traceback
             traceback.print_exc()
-            return []
+
+    def load_csv_data(self) -> List[Dict]:
+        """
+        DEPRECATED: Load and parse CSV data
+        Use load_data_from_supabase() instead
+
+        Returns:
+            List of business records from CSV
+        """
+        businesses = list(self.iter_csv_data())
+        print(f"[OK] Loaded {len(businesses)} businesses from CSV")
+        return businesses
 
     def _compare_and_choose_best_location(self, db_location: str, analyzer_location: str) -> tuple:
         """
@@ -259,29 +379,20 @@ class ComprehensiveBusinessAnalyzer:
         score = 0
 
         # Length matters (more detail = higher score)
-        if len(location) > 50:
-            score += 30
-        elif len(location) > 30:
-            score += 20
-        elif len(location) > 15:
-            score += 10
+        score += _LOCATION_LENGTH_SCORES[bisect_left(_LOCATION_LENGTH_BOUNDS, len(location))]
 
         # Check for street address (highest precision)
-        if any(indicator in location.lower() for indicator in ['street', 'st', 'avenue', 'ave', 'road', 'rd', 'boulevard', 'blvd', 'drive', 'dr', 'lane', 'ln']):
+        tokens = set(_LOCATION_TOKEN_SPLIT.split(location.lower()))
+        if tokens & _STREET_INDICATORS:
             score += 40
 
-        # Check for postal/ZIP code (high precision)
-        import re
-        if re.search(r'\b\d{5}\b', location):  # US ZIP
-            score += 30
-        elif re.search(r'\b[A-Z]\d[A-Z]\s?\d[A-Z]\d\b', location):  # Canadian postal
-            score += 30
-
-        # Check for city, state/province format
-        if re.search(r'[A-Z][a-z]+,\s*[A-Z]{2}', location):  # City, ST
-            score += 20
-        elif re.search(r'[A-Z][a-z]+,\s*[A-Z][a-z]+', location):  # City, Country
-            score += 15
+        # Postal/ZIP code (high precision) and city, state/country format in one pass
+        best = {'postal': 0, 'city': 0}
+        for match in _LOCATION_SIGNALS.finditer(location):
+            tier, points = _LOCATION_SIGNAL_WEIGHTS[match.lastgroup]
+            if points > best[tier]:
+                best[tier] = points
+        score += best['postal'] + best['city']
 
         # Multiple commas indicate more detailed address
         comma_count = location.count(',')
@@ -319,11 +430,40 @@ class ComprehensiveBusinessAnalyzer:
         }
 
         try:
-            # Step 1: Analyze website with Playwright
-            print("\n[STEP 1] Website Analysis")
-            website_data = await playwright_analyzer.analyze_website(business['url'])
+            # Favicon is pure URL construction; do it before the network work starts
+            print("\n[FAVICON] Favicon Extraction")
+            try:
+                # We'll use a simple approach - try Google's favicon service
+                favicon_url = _favicon_for_domain(_url_host(business['url']))
+                analysis['favicon_url'] = favicon_url
+                print(f"  [OK] Favicon URL: {favicon_url}")
+            except Exception as e:
+                print(f"  [WARNING] Favicon extraction error: {e}")
+                analysis['favicon_url'] = None
+
+            # Website, marketplace and sentiment lookups are independent: run them together
+            print("\n[STEPS 1-3] Website Analysis, Marketplace Presence and Social Sentiment (concurrent)")
+            website_task = asyncio.create_task(playwright_analyzer.analyze_website(business['url']))
+            marketplace_task = asyncio.create_task(marketplace_scraper.check_marketplace_presence(
+                business['name'],
+                business['url']
+            ))
+            sentiment_task = asyncio.create_task(sentiment_analyzer.analyze_sentiment(
+                business['name'],
+                business['url']
+            ))
+
+            # Step 1: Website analysis gates everything else
+            try:
+                website_data = await website_task
+            except Exception:
+                marketplace_task.cancel()
+                sentiment_task.cancel()
+                raise
 
             if website_data.get('analysis_failed'):
+                marketplace_task.cancel()
+                sentiment_task.cancel()
                 print(f"  [WARNING] Website analysis failed: {website_data.get('error')}")
                 analysis['analysis_status'] = 'failed'
                 analysis['error'] = website_data.get('error')
@@ -348,26 +488,19 @@ class ComprehensiveBusinessAnalyzer:
 
             print(f"  Final location: '{best_location or 'None'}' (source: {source})")
 
-            # Step 2: Extract favicon
-            print("\n[STEP 2] Favicon Extraction")
-            try:
-                # We'll use a simple approach - try Google's favicon service
-                from urllib.parse import urlparse
-                parsed = urlparse(business['url'])
-                domain = parsed.netloc
-                favicon_url = favicon_extractor.get_google_favicon_url(domain)
-                analysis['favicon_url'] = favicon_url
-                print(f"  [OK] Favicon URL: {favicon_url}")
-            except Exception as e:
-                print(f"  [WARNING] Favicon extraction error: {e}")
-                analysis['favicon_url'] = None
-
-            # Step 3: Check marketplace presence
-            print("\n[STEP 3] Marketplace Presence Check")
-            marketplace_presence = await marketplace_scraper.check_marketplace_presence(
-                business['name'],
-                business['url']
+            marketplace_presence, sentiment_data = await asyncio.gather(
+                marketplace_task, sentiment_task, return_exceptions=True
             )
+
+            # Step 2: Marketplace presence
+            if isinstance(marketplace_presence, Exception):
+                print(f"  [WARNING] Marketplace check error: {marketplace_presence}")
+                marketplace_presence = {
+                    'alibaba_verified': False,
+                    'thomasnet_listed': False,
+                    'scraper_available': False,
+                    'error': str(marketplace_presence)
+                }
             analysis['marketplace_presence'] = marketplace_presence
 
             if marketplace_presence.get('alibaba_verified'):
@@ -378,12 +511,13 @@ class ComprehensiveBusinessAnalyzer:
                 print(f"  [OK] Found on ThomasNet: {marketplace_presence.get('thomasnet_url')}")
                 self.stats['thomasnet_found'] += 1
 
-            # Step 4: Social Sentiment Analysis
-            print("\n[STEP 4] Social Sentiment Analysis")
-            sentiment_data = await sentiment_analyzer.analyze_sentiment(
-                business['name'],
-                business['url']
-            )
+            # Step 3: Social Sentiment
+            if isinstance(sentiment_data, Exception):
+                print(f"  [WARNING] Sentiment analysis error: {sentiment_data}")
+                sentiment_data = {
+                    'sentiment_available': False,
+                    'error': str(sentiment_data)
+                }
             analysis['sentiment_data'] = sentiment_data
 
             if sentiment_data.get('sentiment_available'):
@@ -394,8 +528,8 @@ class ComprehensiveBusinessAnalyzer:
                 if sentiment_data.get('analysis_summary'):
                     print(f"  [SUMMARY] {sentiment_data['analysis_summary']}")
 
-            # Step 5: Calculate score (supplier evaluation system)
-            print("\n[STEP 5] Scoring")
+            # Step 4: Calculate score (supplier evaluation system)
+            print("\n[STEP 4] Scoring")
             score_data = supplier_evaluation_scoring.calculate_score(
                 website_data=website_data,
                 marketplace_presence=marketplace_presence,
@@ -438,7 +572,104 @@ class ComprehensiveBusinessAnalyzer:
             analysis['error'] = str(e)
             return analysis
 
-    async def run_analysis(self, limit: int = 20, skip: int = 0, search_id: str = None):
+    async def _process_business(self, business: Dict, index: int, total: int, semaphore: asyncio.Semaphore):
+        """
+        Dedup-check, analyze and save one business while holding a slot of the semaphore
+
+        The URL is claimed and the host's rate limit waited out before a slot is taken,
+        so a run of businesses on one host never holds slots other hosts could use.
+
+        Args:
+            business: Business data from Supabase
+            index: 1-based position, for progress output
+            total: Number of businesses in this run
+            semaphore: Bounds how many businesses are analyzed at once
+        """
+        business_url = business.get('url', '')
+        # A duplicate still being analyzed by another worker isn't in the database yet
+        claimed_elsewhere = bool(business_url) and business_url in self.claimed_urls
+        is_new = not claimed_elsewhere and business_url not in self.existing_urls
+        if business_url:
+            self.claimed_urls.add(business_url)
+        if is_new:
+            await self.host_limiter.wait(_url_host(business_url))
+
+        async with semaphore:
+            print(f"\n{'='*80}")
+            print(f"Progress: {index}/{total}")
+            print(f"{'='*80}")
+
+            self.stats['total_processed'] += 1
+
+            try:
+                # === URL DEDUPLICATION CHECK ===
+                # Skip if this URL was already analyzed
+                if claimed_elsewhere:
+                    print(f"\n[SKIP] Supplier already being analyzed in this run: {business['name']}")
+                    self.stats['successful'] += 1
+                    return
+
+                if not is_new:
+                    print(f"\n[SKIP] Supplier already exists in database: {business['name']}")
+                    print(f"[URL] {business_url}")
+                    print(f"[REASON] Previously analyzed - skipping to save resources")
+                    self.stats['successful'] += 1  # Count as successful (already done)
+                    return
+
+                # Analyze business (only if URL is NEW)
+                print(f"[NEW] Analyzing new supplier: {business['name']}")
+                analysis = await self.analyze_business(business)
+
+                # Queue for the next bulk insert into Supabase
+                if analysis['analysis_status'] == 'completed':
+                    self.pending_writes.append(analysis)
+                    if len(self.pending_writes) >= WRITE_BATCH_SIZE:
+                        await self.flush_pending_writes()
+                else:
+                    self.stats['failed'] += 1
+
+                self.results.append(analysis)
+
+            except Exception as e:
+                print(f"\n[ERROR] Unexpected error analyzing {business['name']}: {e}")
+                self.stats['failed'] += 1
+
+    async def flush_pending_writes(self):
+        """
+        Save all queued analyses to Supabase in one bulk insert and update the stats
+
+        The batch is taken and the stats updated on the event loop, so no worker races
+        either; only the blocking insert runs in a thread, one flush at a time.
+        """
+        batch, self.pending_writes = self.pending_writes, []
+        if not batch:
+            return
+
+        async with self.flush_lock:
+            saved = await asyncio.to_thread(self._save_batch, batch)
+        self.stats['successful'] += saved
+        self.stats['failed'] += len(batch) - saved
+
+    def _save_batch(self, batch: List[Dict]) -> int:
+        """
+        Bulk insert one batch of analyses into Supabase
+
+        Args:
+            batch: Completed analyses to save
+
+        Returns:
+            Number of analyses saved
+        """
+        print(f"\n[DB] Saving {len(batch)} analyses to Supabase suplink_discovered table...")
+        saved = self.suplink_db.save_business_analyses(batch)
+        if saved == len(batch):
+            print("  [OK] Saved to suplink_discovered table")
+        else:
+            print(f"  [ERROR] Failed to save {len(batch) - saved} of {len(batch)} analyses to Supabase")
+        return saved
+
+    async def run_analysis(self, limit: int = 20, skip: int = 0, search_id: str = None,
+                           max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
         """
         Run comprehensive analysis on all businesses
 
@@ -446,6 +677,7 @@ class ComprehensiveBusinessAnalyzer:
             limit: Maximum number of businesses to analyze (None for all)
             skip: Number of businesses to skip from start
             search_id: Optional - If provided, only analyze businesses from this specific search
+            max_concurrency: Maximum number of businesses analyzed at the same time
         """
         self.stats['start_time'] = datetime.now()
 
@@ -463,77 +695,46 @@ class ComprehensiveBusinessAnalyzer:
             self.suplink_db = SuplinkDatabase()
             print("[DB] Connection established\n")
 
-        # Load data from Supabase
-        businesses = self.load_data_from_supabase(search_id=search_id)
+        # Stream businesses from Supabase; only the skip/limit window is kept in memory
+        stop = skip + limit if limit else None
+        businesses = list(islice(self.iter_data_from_supabase(search_id=search_id), skip, stop))
 
         if not businesses:
             print("[ERROR] No businesses to analyze")
             return
 
-        # Apply skip and limit
         if skip > 0:
-            businesses = businesses[skip:]
             print(f"[SKIP] Skipped first {skip} businesses")
 
         if limit:
-            businesses = businesses[:limit]
             print(f"[ANALYZE] Analyzing {len(businesses)} businesses (limited to {limit})")
         else:
             print(f"[ANALYZE] Analyzing all {len(businesses)} businesses")
 
-        # Analyze each business
-        for i, business in enumerate(businesses, 1):
-            print(f"\n{'='*80}")
-            print(f"Progress: {i}/{len(businesses)}")
-            print(f"{'='*80}")
-
-            self.stats['total_processed'] += 1
-
-            try:
-                # === URL DEDUPLICATION CHECK ===
-                # Skip if this URL was already analyzed
-                business_url = business.get('url', '')
-                if business_url:
-                    existing_business = self.suplink_db.get_business_by_url(business_url)
-                    if existing_business:
-                        print(f"\n[SKIP] Supplier already exists in database: {business['name']}")
-                        print(f"[URL] {business_url}")
-                        print(f"[REASON] Previously analyzed - skipping to save resources")
-                        self.stats['successful'] += 1  # Count as successful (already done)
-                        continue
-
-                # Analyze business (only if URL is NEW)
-                print(f"[NEW] Analyzing new supplier: {business['name']}")
-                analysis = await self.analyze_business(business)
-
-                # Save to Supabase
-                if analysis['analysis_status'] == 'completed':
-                    print("\n[DB] Saving to Supabase suplink_discovered table...")
-                    success = self.suplink_db.save_business_analysis(analysis)
-
-                    if success:
-                        self.stats['successful'] += 1
-                        print("  [OK] Saved to suplink_discovered table")
-                    else:
-                        self.stats['failed'] += 1
-                        print("  [ERROR] Failed to save to Supabase")
-                else:
-                    self.stats['failed'] += 1
-
-                self.results.append(analysis)
-
-                # Small delay between analyses to avoid overwhelming servers
-                print("\n[WAIT] Waiting 1 second before next analysis...")
-                await asyncio.sleep(1)
-
-            except Exception as e:
-                print(f"\n[ERROR] Unexpected error analyzing {business['name']}: {e}")
-                self.stats['failed'] += 1
-                continue
+        # One bulk lookup instead of a Supabase round-trip per business
+        self.existing_urls = self.suplink_db.get_existing_urls([b.get('url', '') for b in businesses])
+        print(f"[DEDUP] {len(self.existing_urls)} of these URLs were already analyzed")
+
+        # Analyze businesses concurrently; the semaphore bounds open browser pages
+        print(f"[CONCURRENCY] Up to {max_concurrency} businesses at a time")
+        # Launch Chromium once, with one warm context per worker
+        await playwright_analyzer.ensure_started(max_concurrency)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        self.flush_lock = asyncio.Lock()
+        total = len(businesses)
+        try:
+            await asyncio.gather(*[
+                self._process_business(business, i, total, semaphore)
+                for i, business in enumerate(businesses, 1)
+            ])
+        finally:
+            # Save whatever is left over from the last partial batch
+            await self.flush_pending_writes()
 
         # Cleanup
         await playwright_analyzer.close()
         await marketplace_scraper.close()
+        await close_http_client()
 
         # Print final statistics
         self.stats['end_time'] = datetime.now()
@@ -576,6 +777,8 @@ async def main():
     parser.add_argument('--user-id', type=str, help='User ID to associate with analysis results')
     parser.add_argument('--limit', type=int, default=None, help='Maximum number of businesses to analyze')
     parser.add_argument('--skip', type=int, default=0, help='Number of businesses to skip from start')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help='Maximum number of businesses to analyze at the same time')
 
     args = parser.parse_args()
 
@@ -594,11 +797,12 @@ async def main():
     if args.search_id:
         print(f"\n[MODE] Analyzing ONLY search ID: {args.search_id}")
         print(f"[OPTIMIZATION] This prevents re-analyzing old searches\n")
-        await analyzer.run_analysis(search_id=args.search_id, limit=args.limit, skip=args.skip)
+        await analyzer.run_analysis(search_id=args.search_id, limit=args.limit, skip=args.skip,
+                                    max_concurrency=args.max_concurrency)
     else:
         print(f"\n[MODE] Analyzing ALL searches in database (no filter)")
         print(f"[WARNING] This may re-analyze already processed searches\n")
-        await analyzer.run_analysis(limit=args.limit, skip=args.skip)
+        await analyzer.run_analysis(limit=args.limit, skip=args.skip, max_concurrency=args.max_concurrency)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,37 @@
+"""
+Shared HTTP Client - one keep-alive connection pool for the async API calls
+"""
+import httpx
+
+# Sized for several businesses analyzed concurrently, each making a few API calls
+HTTP_MAX_CONNECTIONS = 50
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+HTTP_TIMEOUT_SECONDS = 10
+
+_http_client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared AsyncClient, creating it on first use
+
+    Only call from coroutines running on the pipeline's event loop.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared AsyncClient (next get_http_client() call opens a new one)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
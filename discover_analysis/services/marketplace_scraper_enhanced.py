@@ -20,30 +20,38 @@ class EnhancedMarketplaceScraper:
         self.browser: Browser = None
         self._initialized = False
         self._init_error = None
+        self._init_lock = None  # created on first use, inside the running loop
 
     async def initialize(self):
         """Initialize Playwright browser"""
         if self._initialized and self.browser and self.browser.is_connected():
             return True
 
-        try:
-            if self.browser:
-                try:
-                    await self.browser.close()
-                except:
-                    pass
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(
-                headless=True,
-                args=['--no-sandbox', '--disable-setuid-sandbox']
-            )
-            self._initialized = True
-            return True
-        except Exception as e:
-            self._init_error = str(e)
-            print(f"[WARNING] Failed to initialize Playwright: {e}")
-            self._initialized = False
-            return False
+        # Businesses are analyzed concurrently; only the first caller launches the browser
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        async with self._init_lock:
+            if self._initialized and self.browser and self.browser.is_connected():
+                return True
+
+            try:
+                if self.browser:
+                    try:
+                        await self.browser.close()
+                    except:
+                        pass
+                self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.chromium.launch(
+                    headless=True,
+                    args=['--no-sandbox', '--disable-setuid-sandbox']
+                )
+                self._initialized = True
+                return True
+            except Exception as e:
+                self._init_error = str(e)
+                print(f"[WARNING] Failed to initialize Playwright: {e}")
+                self._initialized = False
+                return False
 
     async def close(self):
         """Close browser and Playwright"""
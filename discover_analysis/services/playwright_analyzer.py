@@ -4,7 +4,7 @@ Playwright Web Analyzer - Deep website analysis using Playwright
 import re
 import asyncio
 from typing import Dict, List, Optional
-from playwright.async_api import async_playwright, Page, Browser
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 from dotenv import load_dotenv
 import os
 
@@ -24,33 +24,85 @@ class PlaywrightAnalyzer:
         self.max_retries = 2
         self._initialized = False
         self._init_error = None
+        self._init_lock = None  # created on first use, inside the running loop
+        self._context_pool: asyncio.Queue = None  # warm BrowserContexts, see ensure_started()
 
     async def initialize(self):
         """Initialize Playwright browser"""
         if self._initialized and self.browser and self.browser.is_connected():
             return True
 
-        try:
-            if self.browser:
-                try:
-                    await self.browser.close()
-                except:
-                    pass
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(
-                headless=self.headless,
-                args=['--no-sandbox', '--disable-setuid-sandbox', '--disable-dev-shm-usage']
-            )
-            self._initialized = True
-            return True
-        except Exception as e:
-            self._init_error = str(e)
-            print(f"[WARNING] Failed to initialize Playwright: {e}")
-            self._initialized = False
+        # Businesses are analyzed concurrently; only the first caller launches the browser
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        async with self._init_lock:
+            if self._initialized and self.browser and self.browser.is_connected():
+                return True
+
+            try:
+                if self.browser:
+                    try:
+                        await self.browser.close()
+                    except:
+                        pass
+                # Contexts die with the old browser
+                self._context_pool = None
+                self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.chromium.launch(
+                    headless=self.headless,
+                    args=['--no-sandbox', '--disable-setuid-sandbox', '--disable-dev-shm-usage']
+                )
+                self._initialized = True
+                return True
+            except Exception as e:
+                self._init_error = str(e)
+                print(f"[WARNING] Failed to initialize Playwright: {e}")
+                self._initialized = False
+                return False
+
+    async def ensure_started(self, pool_size: int) -> bool:
+        """
+        Launch the browser once and open a pool of reusable contexts
+
+        Args:
+            pool_size: Number of contexts, one per concurrent analysis
+
+        Returns:
+            True if the browser is running
+        """
+        if not await self.initialize():
             return False
 
+        if self._context_pool is None:
+            pool = asyncio.Queue()
+            for _ in range(pool_size):
+                pool.put_nowait(await self.browser.new_context())
+            self._context_pool = pool
+        return True
+
+    async def _acquire_context(self) -> Optional[BrowserContext]:
+        """Take a warm context from the pool (None when no pool was started)"""
+        if self._context_pool is None:
+            return None
+        return await self._context_pool.get()
+
+    async def _release_context(self, context: Optional[BrowserContext]):
+        """Return a context to the pool, dropping cookies left by the last site"""
+        if context is None:
+            return
+        pool = self._context_pool
+        if pool is None or context.browser is not self.browser:
+            # Browser was relaunched or closed meanwhile; this context is dead
+            return
+        try:
+            await context.clear_cookies()
+        except Exception:
+            pass
+        pool.put_nowait(context)
+
     async def close(self):
         """Close browser and Playwright"""
+        self._context_pool = None
         if self.browser:
             await self.browser.close()
             await self.playwright.stop()
@@ -76,6 +128,23 @@ class PlaywrightAnalyzer:
                 'analysis_failed': True
             }
 
+        context = await self._acquire_context()
+        try:
+            return await self._analyze_with_retries(url, context)
+        finally:
+            await self._release_context(context)
+
+    async def _analyze_with_retries(self, url: str, context: Optional[BrowserContext]) -> Dict:
+        """
+        Try each wait strategy in turn until one loads and analyzes the page
+
+        Args:
+            url: Website URL to analyze
+            context: Warm context to open pages in (None to let the browser create one per page)
+
+        Returns:
+            Dictionary with all extracted data
+        """
         # Try with different wait strategies
         wait_strategies = [
             'domcontentloaded',  # Faster - wait for DOM only
@@ -90,7 +159,10 @@ class PlaywrightAnalyzer:
             if not self.browser or not self.browser.is_connected():
                 await self.initialize()
 
-            page = await self.browser.new_page()
+            if context is not None and context.browser is self.browser:
+                page = await context.new_page()
+            else:
+                page = await self.browser.new_page()
 
             try:
                 print(f"[ANALYZING] {url} (attempt {attempt}/{len(wait_strategies)}, strategy: {wait_until})")
@@ -164,7 +236,6 @@ class PlaywrightAnalyzer:
 
                 print(f"[OK] Analysis complete for {data['company_name']}")
                 await page.close()
-                await asyncio.sleep(1)  # Small delay between operations
                 return data
 
             except Exception as e:
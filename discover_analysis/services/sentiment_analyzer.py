@@ -3,10 +3,14 @@ Social Sentiment Analyzer - Analyze online reputation and sentiment
 Searches for news, reviews, and mentions of the business and analyzes sentiment
 """
 import os
-import requests
 from typing import Dict, List
 from dotenv import load_dotenv
 
+try:
+    from services.http_client import get_http_client
+except ImportError:
+    from http_client import get_http_client
+
 load_dotenv()
 
 
@@ -53,7 +57,7 @@ class SentimentAnalyzer:
         try:
             # Search for news about the company
             print(f"  [SEARCHING] Searching for news and mentions about: {company_name}")
-            news_results = self._search_news(company_name)
+            news_results = await self._search_news(company_name)
 
             if not news_results or len(news_results) == 0:
                 result['analysis_summary'] = 'No news or mentions found online'
@@ -86,7 +90,7 @@ class SentimentAnalyzer:
             result['error'] = str(e)
             return result
 
-    def _search_news(self, company_name: str) -> List[Dict]:
+    async def _search_news(self, company_name: str) -> List[Dict]:
         """
         Search for news articles and mentions using Serper API
 
@@ -116,7 +120,8 @@ class SentimentAnalyzer:
                     'Content-Type': 'application/json'
                 }
 
-                response = requests.post(url, json=payload, headers=headers, timeout=10)
+                # Shared keep-alive pool; also keeps the event loop free for other businesses
+                response = await get_http_client().post(url, json=payload, headers=headers, timeout=10)
 
                 if response.status_code == 200:
                     data = response.json()
@@ -5,12 +5,16 @@ Maps to the suplink_discovered table schema
 import os
 import uuid
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 from dotenv import load_dotenv
 from supabase import create_client, Client
+from postgrest.types import ReturnMethod
 
 load_dotenv()
 
+# URLs per .in_() filter; keeps the PostgREST query string well under URL length limits
+URL_LOOKUP_CHUNK_SIZE = 500
+
 
 class SuplinkDatabase:
     """
@@ -74,6 +78,42 @@ class SuplinkDatabase:
             traceback.print_exc()
             return False
 
+    def save_business_analyses(self, analyses: List[Dict]) -> int:
+        """
+        Save several business analyses, inserting all new URLs in one request
+
+        Args:
+            analyses: Complete business analysis records
+
+        Returns:
+            Number of analyses saved
+        """
+        if not analyses:
+            return 0
+
+        try:
+            records = [self._map_to_schema(analysis) for analysis in analyses]
+            existing = self.get_existing_urls([record['website_url'] for record in records])
+            new_records = [record for record in records if record['website_url'] not in existing]
+
+            if new_records:
+                # Nothing reads the inserted rows, so don't have PostgREST echo them back
+                self.client.table('suplink_discovered').insert(
+                    new_records, returning=ReturnMethod.minimal
+                ).execute()
+                print(f"  [OK] Saved {len(new_records)} new businesses in one insert")
+        except Exception as e:
+            # One bad record shouldn't lose the whole batch
+            print(f"  [WARNING] Bulk insert failed ({e}), saving one by one")
+            return sum(1 for analysis in analyses if self.save_business_analysis(analysis))
+
+        # URLs that already have a row take the per-record update path
+        saved = len(new_records)
+        for analysis, record in zip(analyses, records):
+            if record['website_url'] in existing and self.save_business_analysis(analysis):
+                saved += 1
+        return saved
+
     def _map_to_schema(self, data: Dict) -> Dict:
         """
         Map analysis data to Supabase suplink_discovered table schema (STREAMLINED)
@@ -220,6 +260,30 @@ class SuplinkDatabase:
             print(f"[ERROR] Error fetching business: {e}")
             return None
 
+    def get_existing_urls(self, urls: List[str]) -> Set[str]:
+        """
+        Find which of the given URLs already have a row in suplink_discovered
+
+        Args:
+            urls: Website URLs to check
+
+        Returns:
+            Set of the URLs that already exist (empty on error)
+        """
+        existing = set()
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        try:
+            for start in range(0, len(unique_urls), URL_LOOKUP_CHUNK_SIZE):
+                chunk = unique_urls[start:start + URL_LOOKUP_CHUNK_SIZE]
+                result = self.client.table('suplink_discovered').select('website_url').in_(
+                    'website_url', chunk
+                ).execute()
+                existing.update(row['website_url'] for row in result.data or [])
+            return existing
+        except Exception as e:
+            print(f"[ERROR] Error fetching existing URLs: {e}")
+            return existing
+
     def get_top_businesses(self, limit: int = 10, min_score: int = 50) -> List[Dict]:
         """
         Get top-rated businesses
@@ -372,32 +436,21 @@ class SuplinkDatabase:
             Dictionary mapping URL to exists (True/False)
             Example: {'https://example.com': True, 'https://new.com': False}
         """
-        try:
-            if not urls:
-                return {}
-
-            # Query database for these URLs
-            result = self.client.table('suplink_discovered').select('website_url').in_(
-                'website_url', urls
-            ).execute()
-
-            # Create set of existing URLs for fast lookup
-            existing_urls = set(row['website_url'] for row in result.data) if result.data else set()
+        if not urls:
+            return {}
 
-            # Build response dictionary
-            url_status = {url: (url in existing_urls) for url in urls}
+        # Chunked bulk query; on error the URLs it could not check count as new (fail-safe)
+        existing_urls = self.get_existing_urls(urls)
 
-            existing_count = sum(1 for exists in url_status.values() if exists)
-            new_count = len(urls) - existing_count
+        # Build response dictionary
+        url_status = {url: (url in existing_urls) for url in urls}
 
-            print(f"[URL CHECK] {existing_count} existing, {new_count} new out of {len(urls)} total URLs")
+        existing_count = sum(1 for exists in url_status.values() if exists)
+        new_count = len(urls) - existing_count
 
-            return url_status
+        print(f"[URL CHECK] {existing_count} existing, {new_count} new out of {len(urls)} total URLs")
 
-        except Exception as e:
-            print(f"[ERROR] Error checking existing URLs: {e}")
-            # On error, assume all URLs are new (fail-safe)
-            return {url: False for url in urls}
+        return url_status
 
     def get_statistics(self) -> Dict:
         """
@@ -102,6 +102,7 @@ type OverviewPayload = {
   purchaseExpenseRatio: PurchaseExpenseRatio;
   productivityTrend: ProductivityPoint[];
   aiSummary: string | null;
+  aiSummaryPending?: boolean;
   onboardingChecklist?: ChecklistItem[];
   entityStats?: DomainStat[];
   domainCoverage?: DomainStat[];
@@ -159,6 +160,16 @@ const DEFAULT_OVERVIEW: OverviewPayload = {
   recentActivity: [],
 };
 
+type OverviewSummaryEvent = {
+  user_id?: string | null;
+  aiSummary?: string | null;
+};
+
+type OverviewSocket = {
+  on: (event: string, handler: (payload: OverviewSummaryEvent) => void) => void;
+  off: (event: string, handler: (payload: OverviewSummaryEvent) => void) => void;
+};
+
 const getCookie = (name: string) => {
   const value = `; ${document.cookie}`;
   const parts = value.split(`; ${name}=`);
@@ -292,6 +303,25 @@ const ERPOverview: React.FC<ERPOverviewProps> = ({
     fetchOverview(true);
   }, [fetchOverview]);
 
+  // The AI brief is generated after the overview responds and arrives over Socket.IO.
+  useEffect(() => {
+    const socket = (window as unknown as { socket?: OverviewSocket }).socket;
+    if (!socket) {
+      return undefined;
+    }
+    const handleSummary = (payload: OverviewSummaryEvent) => {
+      const erpUserId = getCookie('versatileErpUserId');
+      if (payload.user_id && erpUserId && payload.user_id !== erpUserId) {
+        return;
+      }
+      setData((prev) => ({ ...prev, aiSummary: payload.aiSummary ?? null, aiSummaryPending: false }));
+    };
+    socket.on('overview_summary_ready', handleSummary);
+    return () => {
+      socket.off('overview_summary_ready', handleSummary);
+    };
+  }, []);
+
   const dataHealth = useMemo(
     () => ({ ...DEFAULT_DATA_HEALTH, ...(data.dataHealth ?? DEFAULT_DATA_HEALTH) }),
     [data.dataHealth],
@@ -774,6 +804,11 @@ const ERPOverview: React.FC<ERPOverviewProps> = ({
                 <div className="border-t border-slate-100 px-5 py-5">
                   {data.aiSummary ? (
                     <p className="whitespace-pre-line text-sm leading-relaxed text-slate-600">{data.aiSummary}</p>
+                  ) : data.aiSummaryPending ? (
+                    <div className="flex items-center gap-2 text-sm text-slate-400">
+                      <Loader2 className="h-4 w-4 animate-spin" />
+                      <p>Generating summary…</p>
+                    </div>
                   ) : (
                     <div className="space-y-3 text-sm text-slate-400">
                       <p>Summary not available yet. Refresh the dashboard to request a new analysis.</p>
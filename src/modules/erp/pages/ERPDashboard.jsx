@@ -157,7 +157,15 @@ const erpJsLogic = `
         
         // Socket.IO is initialized in the main React component's useEffect
         if (window.socket) {
-            window.socket.on('connect', () => console.log('[ERP LOG] Socket connected successfully.'));
+            const registerSocket = () => {
+                const userId = getCookie('versatileErpUserId');
+                if (userId) window.socket.emit('register', { userId });
+            };
+            window.socket.on('connect', () => {
+                console.log('[ERP LOG] Socket connected successfully.');
+                registerSocket();
+            });
+            if (window.socket.connected) registerSocket();
             window.socket.on('disconnect', () => console.log('[ERP LOG] Socket disconnected.'));
             window.socket.on('connect_error', (err) => console.error('[ERP LOG] Socket connection error:', err));
             window.socket.on('ai_reply', (data) => receiveAiMessage(data.text));
@@ -207,13 +215,31 @@ const erpJsLogic = `
                 const err = await response.json();
                 throw new Error(err.error || 'Failed to generate report.');
             }
-            const data = await response.json();
             const closeButtonHtml = '<button id="ai-report-close-btn" class="absolute top-3 right-4 text-gray-400 hover:text-gray-700 transition"><svg class="w-6 h-6" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M6 18L18 6M6 6l12 12"></path></svg></button>';
-            dom.aiReportContainer.innerHTML = closeButtonHtml + marked.parse(data.report);
-            document.getElementById('ai-report-close-btn').addEventListener('click', () => {
-                dom.aiReportContainer.style.display = 'none';
-                dom.aiReportContainer.innerHTML = '';
-            });
+            // The report is streamed as Markdown; re-render at most once per frame as chunks arrive.
+            let reportMarkdown = '';
+            let renderPending = false;
+            const renderReport = () => {
+                renderPending = false;
+                dom.aiReportContainer.innerHTML = closeButtonHtml + marked.parse(reportMarkdown);
+                document.getElementById('ai-report-close-btn').addEventListener('click', () => {
+                    dom.aiReportContainer.style.display = 'none';
+                    dom.aiReportContainer.innerHTML = '';
+                });
+            };
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            while (true) {
+                const { done, value } = await reader.read();
+                if (done) break;
+                reportMarkdown += decoder.decode(value, { stream: true });
+                if (!renderPending) {
+                    renderPending = true;
+                    requestAnimationFrame(renderReport);
+                }
+            }
+            reportMarkdown += decoder.decode();
+            renderReport();
         } catch (error) {
             dom.aiReportContainer.innerHTML = \`<div class="p-4 bg-red-50 border border-red-200 rounded-md text-red-700"><strong>Error:</strong> \${error.message}</div>\`;
         } finally {